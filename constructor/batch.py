@@ -0,0 +1,112 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from structures import Beam
+from serialization import BINARY_EXTENSION, load_beam_from_file
+
+
+# Пакетный расчёт сохранённых балок (.bm, .bmb) без графического интерфейса.
+# Каждая модель решается в отдельном процессе пула; результаты печатаются в формате
+# JSON Lines (одна строка на файл) по мере готовности, вместе со временем расчёта.
+#
+#   python batch.py models/ archive/*.bm --workers 8 --output results.jsonl
+
+
+# Разворачивает аргументы командной строки в список файлов: каталог, маска или имя файла.
+# В каталогах ищутся файлы обоих форматов: .bm (JSON) и .bmb (двоичный)
+def collect_files(paths: list[str], recursive: bool = False) -> list[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            directory = os.path.join(path, '**') if recursive else path
+            files.extend(sorted(name for extension in ('*.bm', '*' + BINARY_EXTENSION)
+                                for name in glob.glob(os.path.join(directory, extension), recursive=recursive)))
+        elif glob.has_magic(path):
+            files.extend(sorted(glob.glob(path, recursive=recursive)))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))  # Без повторов, в исходном порядке
+
+
+# Загружает и решает одну модель. Исключения не выбрасываются, а попадают в результат:
+# error — имя класса ошибки (из errors.py для ошибок расчёта), message — её текст
+def solve_file(filename: str, method: str = 'numeric') -> dict:
+    result = {'file': filename}
+    started = time.perf_counter()
+    try:
+        beam = Beam()
+        load_beam_from_file(filename, beam)
+        loaded = time.perf_counter()
+        result['load_time'] = loaded - started
+        with contextlib.redirect_stdout(io.StringIO()):  # solve печатает разбиение на подбалки
+            result['answers'] = beam.solve(method)
+        result['solve_time'] = time.perf_counter() - loaded
+        result['status'] = 'ok'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = type(e).__name__
+        result['message'] = str(e)
+    result['total_time'] = time.perf_counter() - started
+    return result
+
+
+# Решает файлы и отдаёт результаты в порядке готовности.
+# При workers == 1 расчёт идёт в текущем процессе (удобно для отладки)
+def solve_files(files: list[str], method: str = 'numeric', workers: int | None = None):
+    if workers == 1:
+        for filename in files:
+            yield solve_file(filename, method)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(solve_file, filename, method) for filename in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Пакетный расчёт реакций опор для файлов .bm и .bmb")
+    parser.add_argument('paths', nargs='+', help="Каталоги, маски или файлы .bm и .bmb")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Количество процессов (по умолчанию — по числу ядер)")
+    parser.add_argument('-m', '--method', choices=Beam.SOLVE_METHODS, default='numeric',
+                        help="Способ решения")
+    parser.add_argument('-o', '--output', default=None, help="Файл для результатов (по умолчанию — stdout)")
+    parser.add_argument('-r', '--recursive', action='store_true', help="Искать файлы балок во вложенных каталогах")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("Количество процессов должно быть положительным!")
+    return args
+
+
+# Возвращает код завершения: 0 — все модели решены, 1 — были ошибки, 2 — файлы не найдены
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    files = collect_files(args.paths, args.recursive)
+    if not files:
+        print("Файлы балок не найдены", file=sys.stderr)
+        return 2
+
+    failed = 0
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for result in solve_files(files, args.method, args.workers):
+            failed += result['status'] != 'ok'
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"Решено: {len(files) - failed} из {len(files)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
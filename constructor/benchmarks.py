@@ -0,0 +1,141 @@
+import math
+import time
+import tracemalloc
+import numpy as np
+from solver import LinearSystem
+from structures import Beam, Force, Torque, Node, BeamSegment, Support
+
+
+# Замеры для больших сгенерированных моделей. Запуск: python benchmarks.py [количество]
+
+
+# Тот же класс, но с обычным __dict__ — база для сравнения с __slots__
+def with_dict(cls):
+    return type(f"{cls.__name__}WithDict", (cls,), {})
+
+
+FACTORIES = {
+    Force: lambda cls, i: cls(10, 270, i % 4, 1, False),
+    Torque: lambda cls, i: cls(5, i % 4),
+    Node: lambda cls, i: cls(i, 0),
+    BeamSegment: lambda cls, i: cls(None, None),
+    Support: lambda cls, i: cls(Support.Type.PINNED, 0, 0, 0, 0, True, True, False),
+}
+
+
+# Память на один объект (байт) и время создания одного объекта (мкс)
+def measure(cls, factory, count: int) -> tuple[float, float]:
+    started = time.perf_counter()
+    objects = [factory(cls, i) for i in range(count)]
+    elapsed = time.perf_counter() - started
+    del objects
+
+    # Память считается отдельным проходом: трассировка сильно замедляет создание объектов
+    tracemalloc.start()
+    objects = [factory(cls, i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count, elapsed / count * 1e6
+
+
+def benchmark_objects(count: int = 100_000):
+    print(f"{'Класс':<12} {'байт (dict)':>12} {'байт (slots)':>13} {'мкс (dict)':>11} {'мкс (slots)':>12}")
+    for cls, factory in FACTORIES.items():
+        dict_size, dict_time = measure(with_dict(cls), factory, count)
+        slots_size, slots_time = measure(cls, factory, count)
+        print(f"{cls.__name__:<12} {dict_size:>12.0f} {slots_size:>13.0f} {dict_time:>11.2f} {slots_time:>12.2f}")
+
+
+# Сегмент без кэша геометрии, как до его появления: длина и косинусы считаются
+# при каждом обращении — база для сравнения с BeamSegment.length и geometry
+class UncachedSegment(BeamSegment):
+    __slots__ = ()
+
+    @property
+    def length(self) -> float:
+        return math.hypot(self.node1.x - self.node2.x, self.node1.y - self.node2.y)
+
+    @property
+    def geometry(self) -> tuple[float, float, float]:
+        dx, dy = self.node2.x - self.node1.x, self.node2.y - self.node1.y
+        length = math.hypot(dx, dy)
+        return length, dx / length, dy / length
+
+
+# Ломаная из count сегментов с loads силами и одним моментом на каждом
+def loaded_beam(count: int, loads: int) -> Beam:
+    coords = np.column_stack([np.arange(count + 1, dtype=float), np.arange(count + 1) % 2 * 0.5])
+    segments = np.column_stack([np.arange(count), np.arange(1, count + 1)])
+    forces = [(i, 10, 250, 1.1 * k / loads, 1) for i in range(count) for k in range(loads)]
+    torques = [(i, 5, 0.5) for i in range(count)]
+    return Beam.from_arrays(coords, segments, supports=[(0, Support.Type.FIXED.value, 0)],
+                            forces=forces, torques=torques, compact=True)
+
+
+def best_time(action, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+# Проверка отступов нагрузок, сборка системы и отрисовка нагрузок (с)
+def geometry_timings(beam: Beam) -> dict[str, float]:
+    from PyQt6.QtCore import QPointF
+    from PyQt6.QtGui import QPainter, QPixmap
+    from grid import GridWidget
+
+    segments = beam.get_segments()
+
+    # То же сравнение, что в BeamSegment.add_force и add_torque
+    def validate():
+        for segment in segments:
+            for load in segment.forces + segment.torques:
+                if load.node1_dist > segment.length:
+                    raise AssertionError
+
+    grid = GridWidget()
+    grid.beam = beam
+    pixmap = QPixmap(800, 600)
+
+    # Значки рисуются долго, поэтому в подробном режиме — только первая тысяча сегментов
+    def paint(simplified: bool):
+        grid.simplified = simplified
+        painter = QPainter(pixmap)
+        grid.draw_forces_and_torques(painter, QPointF(0, 300), segments if simplified else segments[:1000])
+        painter.end()
+
+    return {
+        'проверка нагрузок': best_time(validate),
+        'сборка системы': best_time(lambda: beam.build_equations(LinearSystem())),
+        'отрисовка (метки)': best_time(lambda: paint(True)),
+        'отрисовка (значки)': best_time(lambda: paint(False)),
+    }
+
+
+def benchmark_geometry(count: int = 20_000, loads: int = 4):
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    beam = loaded_beam(count, loads)
+    beam.reassign_ids()
+    cached = geometry_timings(beam)
+    for segment in beam.get_segments():
+        segment.__class__ = UncachedSegment
+    uncached = geometry_timings(beam)
+
+    print(f"{count} сегментов, {loads} сил и 1 момент на сегмент")
+    print(f"{'Этап':<20} {'мс (без кэша)':>14} {'мс (кэш)':>10}")
+    for stage in cached:
+        print(f"{stage:<20} {uncached[stage] * 1e3:>14.1f} {cached[stage] * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    import sys
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    benchmark_objects(count)
+    print()
+    benchmark_geometry(count // 5)
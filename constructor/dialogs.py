@@ -1,8 +1,10 @@
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QComboBox, QCheckBox, QMessageBox
+    QPushButton, QComboBox, QCheckBox, QMessageBox, QProgressDialog
 )
 from structures import *
+from tasks import SolveTask
 
 # Умная конвертация числа в строку:
 # если число является целым (например, 3.0), то оно преобразуется в '3', а не '3.0'.
@@ -184,8 +186,19 @@ class SolveDialog(QDialog):
 
 # Класс, управляющий открытием диалогов и обработкой их результатов
 class DialogManager:
+    LIVE_SOLVE_DELAY = 50  # Пауза после последней правки перед живым пересчётом, мс
+
     def __init__(self, grid_widget):
         self.grid_widget = grid_widget  # Ссылка на виджет с графиком/сценой
+        self.solve_task = None  # Выполняющийся расчёт (SolveTask) или None
+        self.solve_progress = None  # Окно ожидания с кнопкой отмены
+        # Живой режим: после каждой правки реакции пересчитываются в фоне и рисуются на поле
+        self.live_solve = False
+        self.live_task = None  # Текущий живой расчёт (SolveTask) или None
+        self.live_timer = QTimer()
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.LIVE_SOLVE_DELAY)
+        self.live_timer.timeout.connect(self.start_live_solve)
 
     # Общий метод для открытия диалогов с обработкой ошибок
     def open_dialog(self, dialog_class, apply_func):
@@ -197,6 +210,7 @@ class DialogManager:
             try:
                 apply_func(dialog.get_data())  # Пытаемся применить данные
                 self.grid_widget.update()
+                self.model_changed()
                 break
             except Exception as e:
                 QMessageBox.critical(None, "Ошибка!", str(e))
@@ -258,10 +272,105 @@ class DialogManager:
         self.open_dialog(HingeDialog, apply)
 
 
+    # Запускает расчёт в фоновом потоке и показывает окно ожидания с кнопкой отмены.
+    # Система собирается здесь же (см. SolveTask), поэтому ошибки модели — нет опор,
+    # несвязная балка — сообщаются сразу. Окно результатов открывается, когда придёт ответ;
+    # прежний расчёт при этом отменяется
     def open_solve_dialog(self):
+        self.cancel_solve()
         try:
-            solve = self.grid_widget.beam.solve()  # Получаем результат
-            dialog = SolveDialog(solve)
-            dialog.exec()
+            task = SolveTask(self.grid_widget.beam)
         except Exception as e:
-            QMessageBox.critical(None, "Ошибка!", str(e))
\ No newline at end of file
+            QMessageBox.critical(None, "Ошибка!", str(e))
+            return
+
+        progress = QProgressDialog("Идёт расчёт...", "Отмена", 0, 0)
+        progress.setWindowTitle("Расчёт")
+        progress.setMinimumDuration(300)  # Быстрые расчёты обходятся без окна
+        progress.canceled.connect(self.cancel_solve)
+
+        task.signals.finished.connect(lambda solution: self.solve_finished(task, solution))
+        task.signals.failed.connect(lambda error: self.solve_failed(task, error))
+        self.solve_task, self.solve_progress = task, progress
+        task.start()
+
+    # Отменяет текущий расчёт: его результат будет отброшен
+    def cancel_solve(self):
+        if self.solve_task is not None:
+            self.solve_task.cancel()
+        self.close_solve_progress()
+
+    # reset, а не close: close испускает canceled и не останавливает таймер показа окна
+    def close_solve_progress(self):
+        progress, self.solve_progress = self.solve_progress, None
+        self.solve_task = None
+        if progress is not None:
+            progress.reset()
+            progress.deleteLater()
+
+    def solve_finished(self, task: SolveTask, solution: dict[str, float]):
+        if task.cancelled or task is not self.solve_task:
+            return
+        task.finish()
+        self.close_solve_progress()
+        dialog = SolveDialog(task.beam.readable_answers(solution))
+        dialog.exec()
+
+    def solve_failed(self, task: SolveTask, error: Exception):
+        if task.cancelled or task is not self.solve_task:
+            return
+        self.close_solve_progress()
+        QMessageBox.critical(None, "Ошибка!", str(error))
+
+    # Включает или выключает живой режим; при выключении реакции убираются с поля
+    def set_live_solve(self, enabled: bool):
+        self.live_solve = enabled
+        if enabled:
+            self.model_changed()
+        else:
+            self.live_timer.stop()
+            self.cancel_live_solve()
+            self.show_reactions({})
+
+    # Вызывается после каждой правки модели. Таймер перезапускается, поэтому серия
+    # быстрых правок даёт один расчёт — после последней из них
+    def model_changed(self):
+        if self.live_solve:
+            self.live_timer.start()
+
+    # Запускает расчёт текущей модели; расчёт прежней её версии отменяется. Система собирается
+    # здесь (после правки нагрузок — инкрементально, с разложением из кэша), а в потоке
+    # остаётся только обратная подстановка. Ошибка модели или расчёта (например, ещё нет опор)
+    # окон не открывает, а просто убирает реакции
+    def start_live_solve(self):
+        self.cancel_live_solve()
+        try:
+            task = SolveTask(self.grid_widget.beam)
+        except Exception:
+            self.show_reactions({})
+            return
+        task.signals.finished.connect(lambda solution: self.live_solve_finished(task, solution))
+        task.signals.failed.connect(lambda error: self.live_solve_finished(task, None))
+        self.live_task = task
+        task.start()
+
+    def cancel_live_solve(self):
+        if self.live_task is not None:
+            self.live_task.cancel()
+            self.live_task = None
+
+    def live_solve_finished(self, task: SolveTask, solution: dict | None):
+        if task.cancelled or task is not self.live_task:
+            return
+        self.live_task = None
+        if solution is None:
+            self.show_reactions({})
+            return
+        task.finish()
+        beam = task.beam
+        self.show_reactions({beam.node_numbering[number]: reaction
+                             for number, reaction in beam.support_reactions(solution).items()})
+
+    def show_reactions(self, reactions: dict):
+        self.grid_widget.reactions = reactions
+        self.grid_widget.update()
@@ -33,4 +33,7 @@ class DotBeamError(BaseError):
     pass
 
 class HighDistanceError(BaseError):
-    pass
\ No newline at end of file
+    pass
+
+class FileFormatError(BaseError):
+    pass
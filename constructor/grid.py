@@ -1,12 +1,119 @@
 # Импорт необходимых классов из PyQt6
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPainter, QPen, QColor, QFont, QPixmap, QTransform
-from PyQt6.QtCore import Qt, QPointF, QPoint
+from PyQt6.QtGui import QPainter, QPen, QColor, QFont, QPixmap, QTransform, QPolygonF
+from PyQt6.QtCore import Qt, QPointF, QPoint, QRect, QTimer, pyqtSignal
+from ids import set_current_registry
 from structures import *  # Пользовательские структуры данных (например, Beam, Segment, Force и т.п.)
 import math
+import os
+import numpy as np
+
+# Каталог с изображениями элементов; путь строится от модуля, а не от рабочего каталога
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+# QPolygonF из массива точек (n, 2): координаты копируются прямо в память полигона,
+# без создания QPointF для каждой точки. Пары точек такого полигона рисуются одним drawLines
+def points_to_polygon(points: np.ndarray) -> QPolygonF:
+    polygon = QPolygonF()
+    polygon.resize(len(points))
+    if len(points):
+        buffer = polygon.data()
+        buffer.setsize(len(points) * 2 * np.dtype(np.float64).itemsize)
+        np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)[:] = points
+    return polygon
+
+
+# Расстояние от точки (x, y) до отрезка (x1, y1)–(x2, y2)
+def point_segment_distance(x, y, x1, y1, x2, y2):
+    dx, dy = x2 - x1, y2 - y1
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length_sq))
+    return math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+
+# Пространственный индекс элементов балки для отсечения невидимых и выбора щелчком:
+# сегменты хранятся по описанным прямоугольникам, узлы — по координатам.
+# Номера элементов берутся из нумерации балки. Индекс перестраивается только при изменении топологии балки
+class SceneIndex:
+    def __init__(self, beam):
+        self.beam = beam
+        self.version = beam.topology_version
+        self.node_numbering = beam.node_numbering
+        self.segment_numbering = beam.segment_numbering
+        nodes = beam.get_nodes()
+
+        # Размер ячейки — такой, чтобы на ячейку в среднем приходилось около одного узла
+        xs = [node.x for node in nodes] or [0]
+        ys = [node.y for node in nodes] or [0]
+        extent = max(max(xs) - min(xs), max(ys) - min(ys))
+        cell_size = max(extent / math.sqrt(max(1, len(xs))), 1e-6)
+
+        self.nodes = SpatialHash(cell_size)
+        for node in nodes:
+            self.nodes.insert(node, node.x, node.y)
+        self.segments = SpatialHash(cell_size)
+        for segment in beam.get_segments():
+            self.segments.insert_box(segment, segment.node1.x, segment.node1.y, segment.node2.x, segment.node2.y)
+
+    def is_current(self, beam) -> bool:
+        return beam is self.beam and beam.topology_version == self.version
+
+    # Пары (номер, узел) для узлов внутри прямоугольника в мировых координатах, по порядку номеров
+    def visible_nodes(self, x1, y1, x2, y2):
+        return sorted(((self.node_numbering.number(node), node) for node in self.nodes.query(x1, y1, x2, y2)),
+                      key=lambda pair: pair[0])
+
+    def visible_segments(self, x1, y1, x2, y2):
+        return sorted(((self.segment_numbering.number(segment), segment) for segment in self.segments.query(x1, y1, x2, y2)),
+                      key=lambda pair: pair[0])
+
+    # Элемент под точкой (x, y) в мировых координатах не дальше radius: сначала ближайший узел,
+    # иначе ближайший сегмент (по расстоянию до отрезка). Проверяются только соседние ячейки индекса
+    def hit_test(self, x, y, radius):
+        node = self.nodes.nearest(x, y, radius)
+        if node is not None:
+            return node
+
+        best, best_distance = None, math.inf
+        for segment, _ in self.segments.nearby(x, y, radius):
+            distance = point_segment_distance(x, y, segment.node1.x, segment.node1.y, segment.node2.x, segment.node2.y)
+            if distance <= radius and distance < best_distance:
+                best, best_distance = segment, distance
+        return best
+
+    def __contains__(self, item):
+        return item in self.nodes or item in self.segments
+
 
 # Класс GridWidget — виджет с координатной плоскостью и элементами балки
 class GridWidget(QWidget):
+    # Выбран узел или сегмент щелчком по полю (None — выбор снят)
+    selection_changed = pyqtSignal(object)
+
+    # Запас вокруг видимой области (в пикселях) для значков и подписей элементов за её краем
+    CULL_MARGIN = 150
+    # Размер плитки фона (в пикселях) и наибольшее число плиток в кэше
+    TILE_SIZE = 256
+    MAX_TILES = 512
+    MAX_LABELS = 1024
+    # Уровень детализации: при значках меньше LOD_ICON_SIZE пикселей или при числе видимых
+    # нагрузок больше LOD_MAX_GLYPHS элементы рисуются упрощёнными метками, а подписи —
+    # только там, где они не перекрывают друг друга
+    LOD_ICON_SIZE = 12
+    LOD_MAX_GLYPHS = 2000
+    LOD_MARKER_LENGTH = 8
+    LABEL_CELL = 8
+    # Пауза в прокрутке колеса (мс), после которой жест масштабирования считается законченным
+    GESTURE_END_DELAY = 150
+    # Щелчок попадает в элемент, если тот ближе HIT_RADIUS пикселей;
+    # смещение мыши меньше CLICK_TOLERANCE пикселей между нажатием и отпусканием — это щелчок, а не сдвиг
+    HIT_RADIUS = 6
+    CLICK_TOLERANCE = 3
+    LABEL_GAP = 6  # Минимальный просвет между подписями
+    # Стрелки реакций живого расчёта: длина и размер наконечника, пикселей
+    REACTION_LENGTH = 40
+    REACTION_HEAD = 7
+
     def __init__(self):
         super().__init__()
         self.scale = 40.0  # Масштаб по умолчанию (пикселей на 1 условную единицу)
@@ -17,24 +124,213 @@ class GridWidget(QWidget):
         self.coord_limit = 10000  # Ограничение по координатам (в логических единицах)
         self.margin = 40  # Отступ от краёв (пока не используется)
         self.beam = Beam()  # Объект балки, содержащий узлы, сегменты, нагрузки и т.д.
+        self._scene_index = None  # Индекс элементов балки (см. SceneIndex)
+        self.source_pixmaps = {}  # Загруженные изображения: имя файла -> QPixmap
+        self.pixmap_cache = {}  # Готовые к отрисовке изображения: (имя, ширина, высота, отражение, dpr) -> QPixmap
+        self.background_tiles = {}  # Плитки сетки и осей для текущего масштаба: (i, j) -> QPixmap
+        self.background_key = None  # (масштаб, dpr), для которых построены плитки
+        # Планировщик перерисовки: ввод копится и применяется не чаще одного раза за кадр
+        self.pending_zoom = 1.0  # Накопленный множитель масштаба
+        self.zoom_anchor = QPointF(0, 0)  # Точка экрана, относительно которой масштабируем
+        self.pending_pan = QPointF(0, 0)  # Накопленный сдвиг
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.apply_pending_input)
+        self.gesture_timer = QTimer(self)
+        self.gesture_timer.setSingleShot(True)
+        self.gesture_timer.setInterval(self.GESTURE_END_DELAY)
+        self.gesture_timer.timeout.connect(self.end_gesture)
+        self.snapshot = None  # Во время жеста: (снимок кадра, начало координат на нём, масштаб)
+
+        self.press_pos = None  # Где была нажата ЛКМ (для отличия щелчка от перетаскивания)
+        self.selected = None  # Выбранный узел или сегмент
+
+        self.simplified = False  # Упрощённая отрисовка (см. LOD_ICON_SIZE)
+        self.label_cells = None  # Занятые подписями ячейки экрана в упрощённом режиме
+        self.text_rects = {}  # Размеры подписей: (текст, шрифт) -> QRect
+        self.label_cache = {}  # Подписи на белом фоне: (текст, шрифт, dpr) -> QPixmap
+
+    # Балка на поле; новые элементы, создаваемые в интерфейсе, нумеруются в её реестре ID
+    @property
+    def beam(self) -> Beam:
+        return self._beam
+
+    @beam.setter
+    def beam(self, beam: Beam):
+        self._beam = beam
+        self.reactions = {}  # Реакции живого расчёта: узел -> (Rx, Ry, M)
+        set_current_registry(beam.ids)
+
+    # Номер на поле -> узел или сегмент; нумерацию ведёт сама балка, отрисовка её не меняет
+    @property
+    def node_mapping(self):
+        return self.beam.node_numbering
+
+    @property
+    def segment_mapping(self):
+        return self.beam.segment_numbering
+
+    # Изображение элемента нужного размера. SVG разбирается один раз, а масштабированная
+    # (и при необходимости отражённая) копия создаётся один раз для каждого размера.
+    # Размеры значков ограничены сверху, поэтому кэш не растёт неограниченно
+    def pixmap(self, name, width, height, mirrored=False):
+        ratio = self.devicePixelRatioF()
+        key = (name, width, height, mirrored, ratio)
+        pixmap = self.pixmap_cache.get(key)
+        if pixmap is None:
+            source = self.source_pixmaps.get(name)
+            if source is None:
+                source = QPixmap(os.path.join(IMAGES_DIR, name))
+                self.source_pixmaps[name] = source
+            if mirrored:
+                source = source.transformed(QTransform().scale(-1, 1))
+            pixmap = source.scaled(max(1, round(width * ratio)), max(1, round(height * ratio)),
+                                   Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            pixmap.setDevicePixelRatio(ratio)
+            self.pixmap_cache[key] = pixmap
+        return pixmap
+
+    # Фон (сетка и оси) рисуется плитками TILE_SIZE x TILE_SIZE, привязанными к началу координат.
+    # Плитка рисуется один раз для масштаба и затем только копируется со сдвигом, поэтому
+    # при перетаскивании заново рисуются лишь полосы, впервые попавшие на экран
+    def draw_background(self, painter, center):
+        ratio = self.devicePixelRatioF()
+        if self.background_key != (self.scale, ratio):
+            self.background_tiles.clear()
+            self.background_key = (self.scale, ratio)
+
+        size = self.TILE_SIZE
+        origin_x, origin_y = round(center.x()), round(center.y())
+        for i in range(math.floor(-origin_x / size), math.floor((self.width() - origin_x) / size) + 1):
+            for j in range(math.floor(-origin_y / size), math.floor((self.height() - origin_y) / size) + 1):
+                tile = self.background_tiles.get((i, j))
+                if tile is None:
+                    if len(self.background_tiles) >= self.MAX_TILES:
+                        del self.background_tiles[next(iter(self.background_tiles))]  # Самая старая плитка
+                    tile = self.render_background_tile(i, j, ratio)
+                    self.background_tiles[(i, j)] = tile
+                painter.drawPixmap(origin_x + i * size, origin_y + j * size, tile)
+
+    # Рисует плитку (i, j): её левый верхний угол отстоит от начала координат на (i, j) * TILE_SIZE пикселей
+    def render_background_tile(self, i, j, ratio):
+        size = self.TILE_SIZE
+        tile = QPixmap(round(size * ratio), round(size * ratio))
+        tile.setDevicePixelRatio(ratio)
+        tile.fill(Qt.GlobalColor.white)
+
+        # Линии на краях плитки рисуются в обеих соседних плитках (с запасом на толщину пера)
+        pad = 2 / self.scale
+        bounds = (i * size / self.scale - pad, (i + 1) * size / self.scale + pad,
+                  j * size / self.scale - pad, (j + 1) * size / self.scale + pad)
+        center = QPointF(-i * size, -j * size)
+        spacing, sub_spacing = self.calculate_spacing()
+
+        painter = QPainter(tile)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        self.draw_grid(painter, center, bounds, spacing, sub_spacing, size, size)
+        self.draw_axes(painter, center, size, size)
+        painter.end()
+        return tile
+
+    # Плотный прямоугольник текста (копия: вызывающий код сдвигает её).
+    # Ключ шрифта можно передать заранее, чтобы не запрашивать его для каждой подписи
+    def text_rect(self, painter, text, font_key=None):
+        key = (text, painter.font().key() if font_key is None else font_key)
+        text_rect = self.text_rects.get(key)
+        if text_rect is None:
+            if len(self.text_rects) >= self.MAX_LABELS:
+                self.text_rects.clear()
+            text_rect = painter.fontMetrics().tightBoundingRect(text)
+            self.text_rects[key] = text_rect
+        return QRect(text_rect)
+
+    # Подпись на белом фоне; готовое изображение запоминается для каждого текста
+    def label_pixmap(self, painter, text):
+        ratio = self.devicePixelRatioF()
+        key = (text, painter.font().key(), ratio)
+        pixmap = self.label_cache.get(key)
+        if pixmap is None:
+            if len(self.label_cache) >= self.MAX_LABELS:
+                self.label_cache.clear()
+            text_rect = painter.fontMetrics().tightBoundingRect(text)
+            text_rect.adjust(-1, -1, 1, 1)
+            pixmap = QPixmap(round(text_rect.width() * ratio), round(text_rect.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.white)
+            label_painter = QPainter(pixmap)
+            label_painter.setFont(painter.font())
+            label_painter.setPen(Qt.GlobalColor.black)
+            label_painter.drawText(QRect(0, 0, text_rect.width(), text_rect.height()), Qt.AlignmentFlag.AlignCenter, text)
+            label_painter.end()
+            self.label_cache[key] = pixmap
+        return pixmap
+
+    # Размер значков опор, шарниров и моментов (стрелки сил вдвое длиннее)
+    def icon_size(self):
+        return min(35, int(2 * self.scale))
+
+    # Проверяет, что подпись не перекрывает уже размещённые, и занимает её место.
+    # Экран делится на ячейки LABEL_CELL пикселей: подпись, задевающая занятую ячейку,
+    # пропускается. В полной детализации подписи не отбрасываются
+    def place_label(self, text_rect):
+        if self.label_cells is None:
+            return True
+        cell, gap = self.LABEL_CELL, self.LABEL_GAP
+        cells = [(cx, cy) for cx in range((text_rect.left() - gap) // cell, (text_rect.right() + gap) // cell + 1)
+                 for cy in range((text_rect.top() - gap) // cell, (text_rect.bottom() + gap) // cell + 1)]
+        if any(key in self.label_cells for key in cells):
+            return False
+        self.label_cells.update(cells)
+        return True
+
+    # Индекс элементов текущей балки, перестраиваемый после изменения её топологии
+    def scene_index(self) -> SceneIndex:
+        if self._scene_index is None or not self._scene_index.is_current(self.beam):
+            self._scene_index = SceneIndex(self.beam)
+        return self._scene_index
+
+    # Видимая область с запасом в мировых координатах (ось Y направлена вверх)
+    def visible_area(self, bounds):
+        left, right, top, bottom = bounds
+        margin = self.CULL_MARGIN / self.scale
+        return left - margin, -bottom - margin, right + margin, -top + margin
 
     # Метод отрисовки при каждом обновлении окна
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+
+        # Во время жеста рисуется снимок (если размер окна с тех пор не менялся)
+        if self.snapshot is not None:
+            if self.snapshot[0].deviceIndependentSize().toSize() == self.size():
+                self.paint_snapshot(painter)
+                return
+            self.snapshot = None
         painter.fillRect(self.rect(), Qt.GlobalColor.white)  # Заливка фона
 
         center = QPointF(self.width() / 2, self.height() / 2) + self.offset  # Центр координат с учётом смещения
         bounds = self.calculate_bounds(center)  # Границы видимой области (в логических координатах)
         spacing, sub_spacing = self.calculate_spacing()  # Основное и дополнительное расстояние между линиями сетки
 
+        # Рисуются только элементы, попадающие в видимую область
+        index = self.scene_index()
+        area = self.visible_area(bounds)
+        segments = index.visible_segments(*area)
+        nodes = index.visible_nodes(*area)
+
+        # Мелкие или слишком многочисленные значки заменяются упрощёнными метками
+        loads = sum(len(segment.forces) + len(segment.torques) for _, segment in segments)
+        self.simplified = self.icon_size() < self.LOD_ICON_SIZE or loads > self.LOD_MAX_GLYPHS
+        self.label_cells = set() if self.simplified else None
+
         # Последовательно вызываем отрисовку всех элементов
-        self.draw_grid(painter, center, bounds, spacing, sub_spacing)
-        self.draw_axes(painter, center)
+        self.draw_background(painter, center)
         self.draw_labels(painter, center, bounds, spacing)
-        self.draw_forces_and_torques(painter, center)
-        self.draw_beams(painter, center)
-        self.draw_nodes(painter, center)
+        self.draw_forces_and_torques(painter, center, [segment for _, segment in segments])
+        self.draw_beams(painter, center, segments)
+        self.draw_nodes(painter, center, nodes)
+        self.draw_reactions(painter, center, nodes)
+        self.draw_selection(painter, center)
 
     # Вычисляет левую, правую, верхнюю и нижнюю границу в логических координатах
     def calculate_bounds(self, center):
@@ -53,59 +349,50 @@ class GridWidget(QWidget):
                 return step, step / sub_steps
         return 1.0, 0.2  # Значения по умолчанию
 
-    # Отрисовка сетки (мелкой и крупной)
-    def draw_grid(self, painter, center, bounds, spacing, sub_spacing):
-        left, right, top, bottom = bounds
+    # Отрисовка сетки (мелкой и крупной) на области width x height (по умолчанию — весь виджет)
+    def draw_grid(self, painter, center, bounds, spacing, sub_spacing, width=None, height=None):
+        width = self.width() if width is None else width
+        height = self.height() if height is None else height
 
         # Мелкая (вспомогательная) сетка
         sub_grid_pen = QPen(QColor(220, 220, 220))
         sub_grid_pen.setWidth(0)
         painter.setPen(sub_grid_pen)
-
-        # Вертикальные линии вспомогательной сетки
-        x = int(left // sub_spacing) * sub_spacing
-        while x <= right:
-            if -self.coord_limit <= x <= self.coord_limit:
-                px = center.x() + x * self.scale
-                painter.drawLine(int(px), 0, int(px), self.height())
-            x += sub_spacing
-
-        # Горизонтальные линии вспомогательной сетки
-        y = int(top // sub_spacing) * sub_spacing
-        while y <= bottom:
-            if -self.coord_limit <= y <= self.coord_limit:
-                py = center.y() + y * self.scale
-                painter.drawLine(0, int(py), self.width(), int(py))
-            y += sub_spacing
+        painter.drawLines(self.grid_lines(center, bounds, sub_spacing, width, height))
 
         # Основная сетка (более тёмные линии)
         grid_pen = QPen(Qt.GlobalColor.lightGray)
         grid_pen.setWidth(2)
         painter.setPen(grid_pen)
+        painter.drawLines(self.grid_lines(center, bounds, spacing, width, height))
 
-        x = int(left // spacing) * spacing
-        while x <= right:
-            if -self.coord_limit <= x <= self.coord_limit:
-                px = center.x() + x * self.scale
-                painter.drawLine(int(px), 0, int(px), self.height())
-            x += spacing
-
-        y = int(top // spacing) * spacing
-        while y <= bottom:
-            if -self.coord_limit <= y <= self.coord_limit:
-                py = center.y() + y * self.scale
-                painter.drawLine(0, int(py), self.width(), int(py))
-            y += spacing
+    # Линии сетки с шагом step одним полигоном (пары точек — концы линий): вертикальные, затем горизонтальные
+    def grid_lines(self, center, bounds, step, width, height):
+        left, right, top, bottom = bounds
+        xs = np.arange(math.floor(left / step), math.floor(right / step) + 1) * step
+        ys = np.arange(math.floor(top / step), math.floor(bottom / step) + 1) * step
+        xs = np.trunc(center.x() + xs[np.abs(xs) <= self.coord_limit] * self.scale)
+        ys = np.trunc(center.y() + ys[np.abs(ys) <= self.coord_limit] * self.scale)
+
+        vertical = np.zeros((len(xs), 2, 2))
+        vertical[:, :, 0] = xs[:, None]
+        vertical[:, 1, 1] = height
+        horizontal = np.zeros((len(ys), 2, 2))
+        horizontal[:, :, 1] = ys[:, None]
+        horizontal[:, 1, 0] = width
+        return points_to_polygon(np.concatenate([vertical, horizontal]).reshape(-1, 2))
 
     # Отрисовка осей координат
-    def draw_axes(self, painter, center):
+    def draw_axes(self, painter, center, width=None, height=None):
+        width = self.width() if width is None else width
+        height = self.height() if height is None else height
         axis_pen = QPen(Qt.GlobalColor.black)
         axis_pen.setWidth(2)
         painter.setPen(axis_pen)
 
         if -self.coord_limit <= 0 <= self.coord_limit:
-            painter.drawLine(int(center.x()), 0, int(center.x()), self.height())  # Вертикальная ось
-            painter.drawLine(0, int(center.y()), self.width(), int(center.y()))  # Горизонтальная ось
+            painter.drawLine(int(center.x()), 0, int(center.x()), height)  # Вертикальная ось
+            painter.drawLine(0, int(center.y()), width, int(center.y()))  # Горизонтальная ось
 
     # Подписи координат вдоль сетки
     def draw_labels(self, painter, center, bounds, spacing):
@@ -133,106 +420,137 @@ class GridWidget(QWidget):
                     self.draw_text(painter, self.width() - 6, int(py), str(int(-y) if spacing >= 1 else f"{-y:.2f}"))
             y += spacing
 
-    # Универсальная функция отрисовки текста с белым фоном
+    # Универсальная функция отрисовки текста с белым фоном (центр подписи — в точке x, y)
     def draw_text(self, painter, x, y, text):
-        metrics = painter.fontMetrics()
-        text_rect = metrics.tightBoundingRect(text)
-        text_rect.adjust(-1, -1, 1, 1)
-        text_rect.moveCenter(QPoint(x, y))
-
-        painter.setBrush(Qt.GlobalColor.white)
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawRect(text_rect)
-
+        pixmap = self.label_pixmap(painter, text)
+        size = pixmap.deviceIndependentSize()
+        painter.drawPixmap(QPointF(x - size.width() // 2, y - size.height() // 2), pixmap)
+
+    # Отрисовка сегментов балки: пары (номер, сегмент), по умолчанию — все сегменты
+    def draw_beams(self, painter, center, segments=None):
+        if segments is None:
+            segments = list(enumerate(self.beam.get_segments(), start=1))
+        if not segments:
+            return
+
+        # Концы всех сегментов в экранных координатах: x1, y1, x2, y2
+        ends = np.array([(segment.node1.x, segment.node1.y, segment.node2.x, segment.node2.y)
+                         for _, segment in segments], dtype=float)
+        ends[:, 0::2] = center.x() + ends[:, 0::2] * self.scale
+        ends[:, 1::2] = center.y() - ends[:, 1::2] * self.scale
+
+        pen = QPen(QColor(100, 100, 100), 2)
         painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.setPen(Qt.GlobalColor.black)
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, text)
-
-    # Отрисовка всех сегментов балки
-    def draw_beams(self, painter, center):
-        count = 1
-        self.segment_mapping = {}  # Словарь для хранения соответствия номера сегмента и объекта
-        for segment in self.beam.get_segments():
-            self.segment_mapping[count] = segment
+        painter.setPen(pen)
+        painter.drawLines(points_to_polygon(ends.reshape(-1, 2)))
 
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.setPen(QPen(QColor(100, 100, 100), 2))
-            x1 = center.x() + segment.node1.x * self.scale
-            y1 = center.y() - segment.node1.y * self.scale
-            x2 = center.x() + segment.node2.x * self.scale
-            y2 = center.y() - segment.node2.y * self.scale
-            painter.drawLine(QPointF(x1, y1), QPointF(x2, y2))
+        # Номера у середины сегментов (у наклонных и вертикальных — со сдвигом)
+        dx, dy = ends[:, 2] - ends[:, 0], ends[:, 3] - ends[:, 1]
+        rect_xs = np.trunc(ends[:, 0] + dx // 2 - np.where(dy == 0, 0, 8)).astype(int).tolist()
+        rect_ys = np.trunc(ends[:, 1] + dy // 2 - np.where(dx == 0, 0, 8)).astype(int).tolist()
 
+        labels = []
+        font_key = painter.font().key()
+        for (count, _), rect_x, rect_y in zip(segments, rect_xs, rect_ys):
             text = str(count)
-            metrics = painter.fontMetrics()
-            text_rect = metrics.tightBoundingRect(text)
-
-            rect_x = int(x1 + (x2 - x1) // 2 - (0 if y2 - y1 == 0 else 8)) 
-            rect_y = int(y1 + (y2 - y1) // 2 - (0 if x2 - x1 == 0 else 8))
-
+            text_rect = self.text_rect(painter, text, font_key)
             text_rect.moveCenter(QPoint(rect_x, rect_y))
             text_rect.adjust(-1, -1, 0, 1)
+            if self.place_label(text_rect):
+                labels.append((text_rect, text))
 
-            painter.setBrush(Qt.GlobalColor.white)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRect(text_rect)
+        painter.setBrush(Qt.GlobalColor.white)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRects([text_rect for text_rect, _ in labels])
 
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.setPen(QPen(QColor(100, 100, 100), 2))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.setPen(pen)
+        for text_rect, text in labels:
             painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, text)
 
-            count += 1
-
-    # Отрисовка всех сил и моментов на балке
-    def draw_forces_and_torques(self, painter, center):
-        for segment in self.beam.get_segments():
+    # Отрисовка сил и моментов на сегментах (по умолчанию — на всех)
+    def draw_forces_and_torques(self, painter, center, segments=None):
+        if segments is None:
+            segments = self.beam.get_segments()
+        if self.simplified:
+            self.draw_load_markers(painter, center, segments)
+            return
+        for segment in segments:
+            if not segment.forces and not segment.torques:
+                continue
+            # Точка приложения — node1 плюс отступ вдоль направления сегмента (из кэша геометрии);
+            # ось Y экрана направлена вниз
+            _, cos, sin = segment.geometry
             x1 = center.x() + segment.node1.x * self.scale
             y1 = center.y() - segment.node1.y * self.scale
-            x2 = center.x() + segment.node2.x * self.scale
-            y2 = center.y() - segment.node2.y * self.scale
+            dx, dy = cos * self.scale, -sin * self.scale
 
             for force in segment.forces:
-                self.draw_force(painter, x1, y1, x2, y2, segment.length, force)
+                self.draw_force(painter, x1 + force.node1_dist * dx, y1 + force.node1_dist * dy, force)
             for torque in segment.torques:
-                self.draw_torque(painter, x1, y1, x2, y2, segment.length, torque)
+                self.draw_torque(painter, x1 + torque.node1_dist * dx, y1 + torque.node1_dist * dy, torque)
 
-    # Отрисовка одной силы (стрелка + подпись)
-    def draw_force(self, painter, x1, y1, x2, y2, length, force):
-        x = x1 + force.node1_dist * (x2 - x1) / length
-        y = y1 + force.node1_dist * (y2 - y1) / length
-
-        size_y = int(2 * self.scale)
-        size_y = 35 if size_y > 35 else size_y
+    # Отрисовка одной силы (стрелка + подпись) в точке (x, y) экрана
+    def draw_force(self, painter, x, y, force):
+        size_y = self.icon_size()
         size_x = size_y * 2
 
         painter.save()
         painter.translate(x, y)
         painter.rotate(-force.angle)
-        painter.drawPixmap(-size_x, -size_y // 2, size_x, size_y, QPixmap("images\\arrow.svg"))
+        painter.drawPixmap(-size_x, -size_y // 2, self.pixmap("arrow.svg", size_x, size_y))
         painter.restore()
 
         text = f'{force.value} Н'
         self.draw_annotation(painter, x, y, size_x, force.angle, text)
 
-    # Отрисовка одного крутящего момента
-    def draw_torque(self, painter, x1, y1, x2, y2, length, torque):
-        x = x1 + torque.node1_dist * (x2 - x1) / length
-        y = y1 + torque.node1_dist * (y2 - y1) / length
-
-        size = int(2 * self.scale)
-        size = 35 if size > 35 else size
+    # Отрисовка одного крутящего момента в точке (x, y) экрана
+    def draw_torque(self, painter, x, y, torque):
+        size = self.icon_size()
 
         painter.save()
         painter.translate(x, y)
-        if torque.value < 0:
-            painter.drawPixmap(-size // 2, -size // 2, size, size, QPixmap("images\\circlearrow.svg").transformed(QTransform().scale(-1, 1)))
-        else:
-            painter.drawPixmap(-size // 2, -size // 2, size, size, QPixmap("images\\circlearrow.svg"))
+        painter.drawPixmap(-size // 2, -size // 2, self.pixmap("circlearrow.svg", size, size, mirrored=torque.value < 0))
         painter.restore()
 
         text = f'{torque.value} Нм'
         self.draw_annotation(painter, x, y, size, 0, text)
 
+    # Упрощённые нагрузки: сила — штрих к точке приложения, момент — точка. Нагрузки,
+    # попадающие в один пиксель (у сил — ещё и с одним направлением), сливаются в одну метку.
+    # Всё рисуется двумя пакетными вызовами, подписи значений не выводятся
+    def draw_load_markers(self, painter, center, segments):
+        forces, torques = [], []
+        for segment in segments:
+            if not segment.forces and not segment.torques:
+                continue
+            _, cos, sin = segment.geometry
+            x1 = center.x() + segment.node1.x * self.scale
+            y1 = center.y() - segment.node1.y * self.scale
+            dx, dy = cos * self.scale, -sin * self.scale
+            for force in segment.forces:
+                forces.append((x1 + force.node1_dist * dx, y1 + force.node1_dist * dy, force.angle))
+            for torque in segment.torques:
+                torques.append((x1 + torque.node1_dist * dx, y1 + torque.node1_dist * dy))
+
+        if forces:
+            points = np.unique(np.round(np.array(forces)), axis=0)
+            angles = np.radians(points[:, 2])
+            length = self.LOD_MARKER_LENGTH
+            lines = np.empty((len(points), 2, 2))
+            lines[:, 0, 0] = points[:, 0] - length * np.cos(angles)
+            lines[:, 0, 1] = points[:, 1] + length * np.sin(angles)
+            lines[:, 1] = points[:, :2]
+            painter.setPen(QPen(Qt.GlobalColor.black, 1))
+            painter.drawLines(points_to_polygon(lines.reshape(-1, 2)))
+
+        if torques:
+            points = np.unique(np.round(np.array(torques)), axis=0)
+            pen = QPen(QColor(200, 0, 0), 4)
+            pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+            painter.setPen(pen)
+            painter.drawPoints(points_to_polygon(points))
+
     # Отрисовка поясняющей подписи к силе или моменту
     def draw_annotation(self, painter, x, y, size, angle, text):
         metrics = painter.fontMetrics()
@@ -250,49 +568,71 @@ class GridWidget(QWidget):
         painter.setPen(Qt.GlobalColor.black)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, text)
 
-    # Отрисовка всех узлов балки
-    def draw_nodes(self, painter, center):
+    # Отрисовка узлов балки: пары (номер, узел), по умолчанию — все узлы
+    def draw_nodes(self, painter, center, nodes=None):
         node_radius = 2
-        count = 1
-        self.node_mapping = {}
-        for node in self.beam.get_nodes():
-            self.node_mapping[count] = node
+        if nodes is None:
+            nodes = list(enumerate(self.beam.get_nodes(), start=1))
+
+        # В упрощённом режиме опоры — квадратные метки, нарисованные одним вызовом
+        if self.simplified:
+            supports = [(node.x, node.y) for _, node in nodes if node.support]
+            if supports:
+                points = np.array(supports, dtype=float) * (self.scale, -self.scale) + (center.x(), center.y())
+                pen = QPen(QColor(60, 60, 60), 6)
+                pen.setCapStyle(Qt.PenCapStyle.SquareCap)
+                painter.setPen(pen)
+                painter.drawPoints(points_to_polygon(points))
+
+            # Узлы — точки одним вызовом на цвет (шарниры красные), подписи — без наложений
+            for hinged, color in ((False, QColor(0, 0, 255, 127)), (True, QColor(255, 0, 0, 127))):
+                points = [(node.x, node.y) for _, node in nodes if (node.hinge is not None) == hinged]
+                if points:
+                    points = np.array(points, dtype=float) * (self.scale, -self.scale) + (center.x(), center.y())
+                    pen = QPen(color, node_radius * 4)
+                    pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+                    painter.setPen(pen)
+                    painter.drawPoints(points_to_polygon(points))
 
+        metrics = painter.fontMetrics()
+        font_key = painter.font().key()
+        for count, node in nodes:
             x = center.x() + node.x * self.scale
             y = center.y() - node.y * self.scale
 
-            if node.support:
-                size = int(2 * self.scale)
-                size = 35 if size > 35 else size
+            if node.support and not self.simplified:
+                size = self.icon_size()
                 painter.save()
                 painter.translate(x, y)
                 painter.rotate(-node.support.angle)
 
                 match node.support.support_type:
-                    case Support.Type.FIXED: image = QPixmap("images\\support0.svg")
-                    case Support.Type.PINNED: image = QPixmap("images\\support1.svg")
-                    case Support.Type.ROLLER: image = QPixmap("images\\support2.svg")
-                painter.drawPixmap(-size // 2, -size // 2 + 12, size, size, image)
+                    case Support.Type.FIXED: image = "support0.svg"
+                    case Support.Type.PINNED: image = "support1.svg"
+                    case Support.Type.ROLLER: image = "support2.svg"
+                painter.drawPixmap(-size // 2, -size // 2 + 12, self.pixmap(image, size, size))
                 painter.restore()
 
             node_brush = QColor(0, 0, 255, 127)
             node_text_pen = Qt.GlobalColor.blue
             if node.hinge:
-                size = int(2 * self.scale)
-                size = 35 if size > 35 else size
-                painter.drawPixmap(int(x - size // 2), int(y - size // 2), size, size, QPixmap("images\\hinge.svg"))
+                if not self.simplified:  # В упрощённом режиме шарнир виден по цвету узла
+                    size = self.icon_size()
+                    painter.drawPixmap(int(x - size // 2), int(y - size // 2), self.pixmap("hinge.svg", size, size))
                 node_text_pen = Qt.GlobalColor.red
                 node_brush = QColor(255, 0, 0, 127)
 
-            painter.setBrush(node_brush)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawEllipse(QPointF(x, y), node_radius * 2, node_radius * 2)
+            if not self.simplified:
+                painter.setBrush(node_brush)
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.drawEllipse(QPointF(x, y), node_radius * 2, node_radius * 2)
 
             text = str(count)
-            metrics = painter.fontMetrics()
-            text_rect = metrics.tightBoundingRect(text)
+            text_rect = self.text_rect(painter, text, font_key)
             text_rect.moveCenter(QPoint(int(x), int(y - metrics.height() / 2 - node_radius - 1)))
             text_rect.adjust(-1, -1, 0, 1)
+            if not self.place_label(text_rect):
+                continue
 
             painter.setBrush(Qt.GlobalColor.white)
             painter.setPen(Qt.PenStyle.NoPen)
@@ -302,51 +642,178 @@ class GridWidget(QWidget):
             painter.setPen(node_text_pen)
             painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, text)
 
-            count += 1
+    # Реакции опор из живого расчёта: составляющие X и Y — зелёные стрелки, приходящие
+    # в узел по направлению реакции, момент — подпись справа под узлом. Стрелки всех узлов
+    # рисуются одним вызовом drawLines
+    def draw_reactions(self, painter, center, nodes):
+        if not self.reactions:
+            return
+        length, head = self.REACTION_LENGTH, self.REACTION_HEAD
+        lines, labels = [], []
+        for _, node in nodes:
+            reaction = self.reactions.get(node)
+            if reaction is None:
+                continue
+            x = center.x() + node.x * self.scale
+            y = center.y() - node.y * self.scale
+            rx, ry, torque = reaction
+            # Направление стрелки на экране (ось Y экрана направлена вниз)
+            for value, dx, dy in ((rx, 1.0, 0.0), (ry, 0.0, -1.0)):
+                if round(value, 2) == 0:
+                    continue
+                if value < 0:
+                    dx, dy = -dx, -dy
+                back_x, back_y = x - dx * head, y - dy * head
+                lines += [(x - dx * length, y - dy * length), (x, y),
+                          (x, y), (back_x - dy * head / 2, back_y + dx * head / 2),
+                          (x, y), (back_x + dy * head / 2, back_y - dx * head / 2)]
+                labels.append((x - dx * (length + 12), y - dy * (length + 12), f'{abs(value):.2f} Н'))
+            if round(torque, 2) != 0:
+                labels.append((x + length, y + 2 * head + 12, f'M = {torque:.2f} Нм'))
+
+        if lines:
+            pen = QPen(QColor(0, 150, 70), 2)
+            pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+            painter.setPen(pen)
+            painter.drawLines(points_to_polygon(np.array(lines, dtype=float)))
+        for x, y, text in labels:
+            self.draw_text(painter, x, y, text)
 
     # Сброс смещения (центрируется координатная сетка)
     def resetOffset(self):
+        self.pending_pan = QPointF(0, 0)
         self.offset = QPointF(0, 0)
         self.update()
 
-    # Обработка колесика мыши для увеличения/уменьшения масштаба
+    # Обработка колесика мыши для увеличения/уменьшения масштаба.
+    # Изменение не применяется сразу, а накапливается до ближайшего кадра (см. schedule_frame)
     def wheelEvent(self, event):
         zoom_in_factor = 1.1
         zoom_out_factor = 0.9
 
-        old_scale = self.scale
-        if event.angleDelta().y() > 0:
-            self.scale *= zoom_in_factor
-        else:
-            self.scale *= zoom_out_factor
-
-        self.scale = max(self.min_scale, min(self.max_scale, self.scale))
-
-        mouse_pos = event.position()
-        center = QPointF(self.width() / 2, self.height() / 2)
-        mouse_delta = mouse_pos - center - self.offset
-        self.offset -= mouse_delta * (self.scale / old_scale - 1)
+        self.pending_zoom *= zoom_in_factor if event.angleDelta().y() > 0 else zoom_out_factor
+        self.zoom_anchor = event.position()
 
-        self.clamp_offset()
-        self.update()
+        self.begin_gesture()
+        self.gesture_timer.start()  # Жест масштабирования заканчивается паузой в прокрутке
+        self.schedule_frame()
 
     # При нажатии ЛКМ — сохраняем позицию
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.last_mouse_pos = event.position()
+            self.press_pos = event.position()
 
-    # При движении мыши с зажатой ЛКМ — смещаем сетку
+    # При движении мыши с зажатой ЛКМ — смещаем сетку (сдвиг накапливается до ближайшего кадра)
     def mouseMoveEvent(self, event):
         if self.last_mouse_pos is not None:
-            delta = event.position() - self.last_mouse_pos
-            self.offset += delta
+            self.pending_pan += event.position() - self.last_mouse_pos
             self.last_mouse_pos = event.position()
-            self.clamp_offset()
-            self.update()
+            self.begin_gesture()
+            self.schedule_frame()
 
-    # Отпускание кнопки мыши — обнуляем перемещение
+    # Отпускание кнопки мыши — обнуляем перемещение и рисуем кадр в полном качестве.
+    # Если мышь почти не сдвинулась, это щелчок: выбираем элемент под курсором
     def mouseReleaseEvent(self, event):
+        press_pos, self.press_pos = self.press_pos, None
         self.last_mouse_pos = None
+        if press_pos is not None and (event.position() - press_pos).manhattanLength() < self.CLICK_TOLERANCE:
+            self.pending_pan = QPointF(0, 0)  # Дрожание руки при щелчке не сдвигает поле
+            self.select(self.item_at(event.position()))
+        if self.snapshot is not None:
+            self.end_gesture()
+
+    # Мировые координаты точки экрана
+    def screen_to_world(self, pos):
+        origin = self.origin()
+        return (pos.x() - origin.x()) / self.scale, (origin.y() - pos.y()) / self.scale
+
+    # Узел или сегмент под точкой экрана (или None)
+    def item_at(self, pos):
+        x, y = self.screen_to_world(pos)
+        return self.scene_index().hit_test(x, y, self.HIT_RADIUS / self.scale)
+
+    def select(self, item):
+        if item is not self.selected:
+            self.selected = item
+            self.selection_changed.emit(item)
+            self.update()
+
+    # Подсветка выбранного элемента (если он ещё принадлежит балке)
+    def draw_selection(self, painter, center):
+        if self.selected is None or self.selected not in self.scene_index():
+            return
+        pen = QPen(QColor(255, 140, 0), 4)
+        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        if isinstance(self.selected, Node):
+            painter.drawEllipse(QPointF(center.x() + self.selected.x * self.scale,
+                                        center.y() - self.selected.y * self.scale), 7, 7)
+        else:
+            node1, node2 = self.selected.node1, self.selected.node2
+            painter.drawLine(QPointF(center.x() + node1.x * self.scale, center.y() - node1.y * self.scale),
+                             QPointF(center.x() + node2.x * self.scale, center.y() - node2.y * self.scale))
+
+    # Интервал между кадрами: один кадр на период обновления экрана
+    def frame_interval(self):
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return max(1, int(1000 / (rate if rate > 0 else 60)))
+
+    # Запрашивает применение накопленного ввода; события до срабатывания таймера сливаются в один кадр
+    def schedule_frame(self):
+        if not self.frame_timer.isActive():
+            self.frame_timer.start(self.frame_interval())
+
+    # Применяет накопленные сдвиг и масштабирование за один шаг
+    def apply_pending_input(self):
+        self.frame_timer.stop()
+        if self.pending_pan != QPointF(0, 0):
+            self.offset += self.pending_pan
+            self.pending_pan = QPointF(0, 0)
+
+        if self.pending_zoom != 1.0:
+            old_scale = self.scale
+            self.scale = max(self.min_scale, min(self.max_scale, self.scale * self.pending_zoom))
+            self.pending_zoom = 1.0
+
+            center = QPointF(self.width() / 2, self.height() / 2)
+            mouse_delta = self.zoom_anchor - center - self.offset
+            self.offset -= mouse_delta * (self.scale / old_scale - 1)
+
+        self.clamp_offset()
+        self.update()
+
+    # Начало жеста: запоминаем текущий кадр, пока жест идёт, рисуется его преобразованная копия
+    def begin_gesture(self):
+        if self.snapshot is None:
+            self.snapshot = (self.grab(), self.origin(), self.scale)
+
+    # Конец жеста: применяем остаток ввода и рисуем кадр в полном качестве
+    def end_gesture(self):
+        self.gesture_timer.stop()
+        self.snapshot = None
+        self.apply_pending_input()
+
+    # Положение начала координат на экране
+    def origin(self):
+        return QPointF(self.width() / 2, self.height() / 2) + self.offset
+
+    # Дешёвый кадр во время жеста: сохранённый снимок, сдвинутый и масштабированный к текущему виду.
+    # При сдвиге без масштабирования открывшиеся полосы заполняет фон из кэша плиток
+    def paint_snapshot(self, painter):
+        pixmap, origin, scale = self.snapshot
+        center = self.origin()
+        painter.fillRect(self.rect(), Qt.GlobalColor.white)
+        if scale == self.scale:
+            self.draw_background(painter, center)
+
+        factor = self.scale / scale
+        painter.translate(center)
+        painter.scale(factor, factor)
+        painter.translate(-origin)
+        painter.drawPixmap(0, 0, pixmap)
 
     # Ограничение на смещение — чтобы не "уйти" за пределы допустимых координат
     def clamp_offset(self):
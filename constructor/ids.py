@@ -1,26 +1,100 @@
-from abc import ABCMeta, ABC
+import threading
+from abc import ABC
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 
-class _IDMeta(ABCMeta):
-    def __new__(cls, name, bases, dct):
-        dct['_next_id'] = 1
-        dct['_used_ids'] = set()
-        return super().__new__(cls, name, bases, dct)
+# Реестр занятых ID: для каждого класса — следующий свободный номер и множество занятых.
+# У каждой балки свой реестр (Beam.ids), поэтому несколько моделей могут жить в одном
+# процессе и собираться/решаться параллельно, не мешая нумерации друг друга.
+# Все операции защищены блокировкой: общим реестром пользуются разные потоки.
+class IDRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_ids: dict[type, int] = {}
+        self._used_ids: dict[type, set[int]] = {}
 
+    # Занимает custom_id (или первый свободный номер, если он не задан) и возвращает его
+    def allocate(self, cls: type, custom_id: int | None = None) -> int:
+        with self._lock:
+            used = self._used_ids.setdefault(cls, set())
+            if custom_id is not None:
+                new_id = int(custom_id)
+                if new_id in used:
+                    raise ValueError(f"ID {new_id} уже занят в {cls.__name__}")
+            else:
+                new_id = self._next_ids.get(cls, 1)
+                while new_id in used:
+                    new_id += 1
+                self._next_ids[cls] = new_id + 1
+            used.add(new_id)
+            return new_id
+
+    def release(self, cls: type, obj_id: int):
+        with self._lock:
+            self._used_ids.get(cls, set()).discard(obj_id)
+
+    # Меняет занятый номер old_id на new_id
+    def rename(self, cls: type, old_id: int, new_id: int):
+        with self._lock:
+            used = self._used_ids.setdefault(cls, set())
+            if new_id in used:
+                raise ValueError(f"ID {new_id} уже занят в {cls.__name__}")
+            used.discard(old_id)
+            used.add(new_id)
+
+    def is_used(self, cls: type, obj_id: int) -> bool:
+        with self._lock:
+            return obj_id in self._used_ids.get(cls, ())
+
+    # Забывает все занятые номера: нумерация всех классов начинается заново с 1
+    def reset(self):
+        with self._lock:
+            self._next_ids.clear()
+            self._used_ids.clear()
+
+    # Блокировку нельзя скопировать или сериализовать: копия реестра получает свою
+    def __getstate__(self):
+        with self._lock:
+            return {'_next_ids': dict(self._next_ids), '_used_ids': {cls: set(ids) for cls, ids in self._used_ids.items()}}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # Новые объекты внутри блока with получают ID из этого реестра (только в текущем потоке/контексте)
+    @contextmanager
+    def activate(self):
+        token = _current_registry.set(self)
+        try:
+            yield self
+        finally:
+            _current_registry.reset(token)
+
+
+# Реестр по умолчанию — для объектов, созданных вне какой-либо модели
+default_registry = IDRegistry()
+_current_registry: ContextVar[IDRegistry] = ContextVar('current_id_registry', default=default_registry)
+
+
+def current_registry() -> IDRegistry:
+    return _current_registry.get()
+
+
+# Делает реестр текущим до следующего вызова (например, для балки, открытой в интерфейсе)
+def set_current_registry(registry: IDRegistry):
+    _current_registry.set(registry)
+
+
+# Наследники объявляют __slots__, чтобы объекты модели не несли собственный __dict__:
+# при сотнях тысяч нагрузок это заметно экономит память и ускоряет создание.
+# ID выдаётся текущим реестром (current_registry) и уникален в пределах этого реестра
+class IDNumerator(ABC):
+    __slots__ = ('_id', '_registry')
 
-class IDNumerator(ABC, metaclass=_IDMeta):
     def __init__(self, custom_id: int | None = None):
-        cls = self.__class__
-        if custom_id is not None:
-            if custom_id in cls._used_ids:
-                raise ValueError(f"ID {custom_id} уже занят в {cls.__name__}")
-            self._id = int(custom_id)
-        else:
-            while cls._next_id in cls._used_ids:
-                cls._next_id += 1
-            self._id = int(cls._next_id)
-            cls._next_id += 1
-        cls._used_ids.add(self._id)
+        self._registry: IDRegistry = current_registry()
+        self._id = self._registry.allocate(self.__class__, custom_id)
 
     @property
     def id(self) -> int:
@@ -28,18 +102,24 @@ class IDNumerator(ABC, metaclass=_IDMeta):
 
     @id.setter
     def id(self, new_id: int):
-        cls = self.__class__
         new_id = int(new_id)
         if new_id == self._id:
             return  # ничего не меняем
-        if new_id in cls._used_ids:
-            raise ValueError(f"ID {new_id} уже занят в {cls.__name__}")
-        # Снимаем старый ID
-        if self._id in cls._used_ids:
-            cls._used_ids.remove(self._id)
-        # Присваиваем новый
+        self._registry.rename(self.__class__, self._id, new_id)
         self._id = new_id
-        cls._used_ids.add(self._id)
+
+    @property
+    def registry(self) -> IDRegistry:
+        return self._registry
+
+    # Переносит объект в другой реестр с номером new_id (или первым свободным).
+    # Старый номер освобождается, если объект жил в другом реестре; при перенумерации
+    # внутри того же реестра его нужно предварительно сбросить (reset)
+    def bind_id(self, registry: IDRegistry, new_id: int | None = None):
+        if registry is not self._registry:
+            self._registry.release(self.__class__, self._id)
+        self._id = registry.allocate(self.__class__, new_id)
+        self._registry = registry
 
 
 # Пример использования
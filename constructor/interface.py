@@ -1,6 +1,6 @@
 # Импорт необходимых классов из PyQt6 для создания графического интерфейса
 from PyQt6.QtWidgets import (
-    QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QFileDialog, QMessageBox
+    QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QFileDialog, QMessageBox, QCheckBox
 )
 
 from structures import *
@@ -74,6 +74,11 @@ class MainWindow(QWidget):
         solve_button.clicked.connect(self.dialogs.open_solve_dialog)  # Открывает диалог расчёта
         left_layout.addWidget(solve_button)
 
+        # Живой расчёт: реакции пересчитываются после каждой правки и рисуются на поле
+        live_solve_checkbox = QCheckBox("Живой расчёт")
+        live_solve_checkbox.toggled.connect(self.dialogs.set_live_solve)
+        left_layout.addWidget(live_solve_checkbox)
+
         # Кнопка сброса смещения (перемещения) координатной плоскости
         reset_offset_button = QPushButton("Вернуться к началу координат")
         reset_offset_button.setMinimumHeight(40)
@@ -122,15 +127,16 @@ class MainWindow(QWidget):
 
     # Метод для сохранения текущей балки в файл
     def save_beam(self):
-        filename, _ = QFileDialog.getSaveFileName(
+        filename, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Сохранить балку",         # Заголовок окна
             "",                        # Путь по умолчанию
-            "Файлы балки (*.bm);;Все файлы (*)"  # Фильтр файлов
+            "Файлы балки (*.bm);;Двоичные файлы балки (*.bmb);;Все файлы (*)"  # Фильтр файлов
         )
         if filename:  # Если пользователь выбрал файл
-            if not filename.endswith(".bm"):
-                filename += ".bm"  # Добавляем расширение, если его нет
+            if not filename.endswith((".bm", BINARY_EXTENSION)):
+                # Добавляем расширение, если его нет (двоичное — если выбран такой фильтр)
+                filename += BINARY_EXTENSION if BINARY_EXTENSION in selected_filter else ".bm"
 
             try:
                 save_beam_to_file(self.grid_widget.beam, filename)
@@ -142,7 +148,7 @@ class MainWindow(QWidget):
     # Метод для загрузки балки из файла
     def load_beam(self):
         # Если на поле уже есть элементы, подтверждаем удаление текущей балки
-        if len(self.grid_widget.beam.graph.nodes) > 0:
+        if self.grid_widget.beam.topology.number_of_nodes() > 0:
             box = QMessageBox(self)
             box.setWindowTitle("Подтверждение загрузки")
             box.setText("Вы хотите загрузить другую балку? Текущая балка будет удалена.")
@@ -162,7 +168,7 @@ class MainWindow(QWidget):
             self,
             "Загрузить балку",
             "",
-            "Файлы балки (*.bm);;Все файлы (*)"
+            "Файлы балки (*.bm *.bmb);;Все файлы (*)"
         )
         if not filename:
             return
@@ -171,6 +177,7 @@ class MainWindow(QWidget):
             self.clear_field()
             load_beam_from_file(filename, self.grid_widget.beam)
             self.grid_widget.update()
+            self.dialogs.model_changed()
 
         except Exception as e:
             QMessageBox.critical(self, "Ошибка загрузки", str(e))  # Ошибка при загрузке
@@ -194,11 +201,7 @@ class MainWindow(QWidget):
 
     # Метод, полностью очищающий поле от элементов и сбрасывающий ID
     def clear_field(self):
-        for cls in [Force, Torque, Support, Hinge, Node, BeamSegment, Beam]:
-            cls._next_id = 1
-            cls._used_ids.clear()
-
-        # Создание новой пустой балки
+        # Создание новой пустой балки (со своим, пустым реестром ID)
         self.grid_widget.beam = Beam()
 
         # Обновление отображения
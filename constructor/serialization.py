@@ -1,5 +1,24 @@
 import json
-from structures import Beam, BeamSegment, Node, Force, Torque, Support, Hinge
+import re
+import struct
+import numpy as np
+from errors import DotBeamError, FileFormatError, HighDistanceError
+from structures import Beam, BeamSegment, Node, Force, Torque, Support, Hinge, merge_points
+
+# Двоичный формат (.bmb) хранит те же данные, что и JSON, но по столбцам: каждый столбец —
+# массив NumPy, который читается через np.memmap без разбора текста. Устройство файла:
+#
+#   BINARY_MAGIC | версия, длина описания (2 × uint32 LE) | описание (JSON, UTF-8) | массивы
+#
+# Описание содержит тип, форму и смещение каждого массива от начала области данных.
+# Область данных и каждый массив выровнены по BINARY_ALIGNMENT байт.
+BINARY_MAGIC = b'BEAMBIN\0'
+BINARY_VERSION = 1
+BINARY_ALIGNMENT = 64
+BINARY_EXTENSION = '.bmb'
+
+# Размер куска, которым читается JSON при потоковой загрузке (символов)
+STREAM_CHUNK_SIZE = 1 << 16
 
 
 def beam_to_dict(beam: Beam) -> dict:
@@ -62,72 +81,454 @@ def beam_to_dict(beam: Beam) -> dict:
         'hinges': [
             {
                 'id': hinge.id,
-                'node_ids': [node.id for node in beam.graph.nodes if node.hinge == hinge]
+                'node_ids': [node.id for node in beam.get_nodes() if node.hinge == hinge]
             }
             for hinge in {node.hinge for node in beam.get_nodes() if node.hinge}
         ]
     }
 
 
+# Файлы с расширением .bmb сохраняются в двоичном формате, остальные — в JSON
 def save_beam_to_file(beam: Beam, filename: str = "beam.bm"):
+    if filename.endswith(BINARY_EXTENSION):
+        write_beam_arrays(dict_to_arrays(beam_to_dict(beam)), filename)
+        return
     with open(filename, "w", encoding="utf-8") as f:
         json.dump(beam_to_dict(beam), f, indent=4)
 
 
+def is_binary_file(filename: str) -> bool:
+    with open(filename, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+# Формат файла определяется по его началу, а не по расширению.
+# JSON читается потоком (load_beam_from_json_stream), без словаря всей модели в памяти
 def load_beam_from_file(filename: str, beam: Beam):
-    with open(filename, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    beam.graph.clear()
-    id_node_map = {}
-
-    for node_data in data['nodes']:
-        node = Node(node_data['x'], node_data['y'], custom_id=node_data['id'])
-        if node_data['support']:
-            s = node_data['support']
-            support = Support(
-                support_type=Support.Type(s['type']),
-                angle=s['angle'],
-                force_x=s['force']['value'],
-                force_y=0,
-                torque=s['torque']['value'],
-                unknown_fx=s['force']['unknown_x'],
-                unknown_fy=s['force']['unknown_y'],
-                unknown_t=s['torque']['unknown'],
-                custom_id=s['id'],
-                is_new=False
-            )
-            support.force.id = s['force']['id']
-            support.torque.id = s['torque']['id']
-            node.add_support(support)
-        id_node_map[node.id] = beam.add_node(node)
-
-    hinge_map = {}
+    if is_binary_file(filename):
+        beam_from_arrays(read_beam_arrays(filename), beam)
+        return
+    load_beam_from_json_stream(filename, beam)
+
+
+# Объекты модели по элементам словаря beam_to_dict. Элементы из файла регистрируют
+# свои ID в текущем реестре — при загрузке это реестр загружаемой балки
+def node_from_dict(node_data: dict) -> Node:
+    node = Node(node_data['x'], node_data['y'], custom_id=node_data['id'])
+    if node_data['support']:
+        s = node_data['support']
+        support = Support(
+            support_type=Support.Type(s['type']),
+            angle=s['angle'],
+            force_x=s['force']['value'],
+            force_y=0,
+            torque=s['torque']['value'],
+            unknown_fx=s['force']['unknown_x'],
+            unknown_fy=s['force']['unknown_y'],
+            unknown_t=s['torque']['unknown'],
+            custom_id=s['id'],
+            is_new=False
+        )
+        support.force.id = s['force']['id']
+        support.torque.id = s['torque']['id']
+        node.add_support(support)
+    return node
+
+
+def hinge_from_dict(hinge_data: dict, id_node_map: dict) -> Hinge:
+    hinge = Hinge(custom_id=hinge_data['id'])
+    for node_id in hinge_data['node_ids']:
+        id_node_map[node_id].hinge = hinge
+    return hinge
+
+
+def segment_from_dict(segment_data: dict, id_node_map: dict) -> BeamSegment:
+    node1 = id_node_map[segment_data['node1_id']]
+    node2 = id_node_map[segment_data['node2_id']]
+    segment = BeamSegment(node1, node2, custom_id=segment_data['id'])
+
+    for f in segment_data['forces']:
+        force = Force(
+            f['value'], f['angle'], f['node1_dist'],
+            f['length'], f['unknown'], custom_id=f['id']
+        )
+        segment.add_force(force)
+
+    for t in segment_data['torques']:
+        torque = Torque(
+            t['value'], t['node1_dist'], t['unknown'], custom_id=t['id']
+        )
+        segment.add_torque(torque)
+    return segment
+
+
+# Чтение JSON из файла по кускам: значения разбираются json.JSONDecoder.raw_decode прямо
+# из буфера, а прочитанная часть буфера отбрасывается. В памяти одновременно находятся
+# лишь текущий кусок файла и один разобранный элемент
+class JSONStream:
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, file, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    # Дочитывает файл, отбрасывая уже разобранное. Если буфер не уместил элемент,
+    # следующий кусок не меньше буфера — так большой элемент читается за O(размер)
+    def read_more(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    # Следующий значимый символ (пробелы пропускаются) или '' в конце файла
+    def peek(self) -> str:
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ''
+
+    def error(self, message: str):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise self.error(f"Ожидался символ {char!r}")
+        self.pos += 1
+
+    # Следующее значение JSON целиком
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.read_more():
+                    continue
+                raise
+            if end == len(self.buffer) and self.read_more():
+                continue  # Число могло оборваться на границе куска
+            self.pos = end
+            return value
+
+    # Элементы массива по одному
+    def items(self):
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise self.error("Ожидался символ ',' или ']'")
+
+    # Ключи объекта по одному; значение каждого ключа вызывающий читает сам (value или items)
+    def keys(self):
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise self.error("Ожидался ключ объекта")
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise self.error("Ожидался символ ',' или '}'")
+
+
+# Потоковая загрузка JSON-файла: узлы, сегменты и шарниры создаются по мере чтения,
+# поэтому пиковая память определяется самой моделью, а не словарём всего файла.
+# beam_to_dict пишет узлы первыми; если в файле сегменты или шарниры стоят раньше узлов,
+# они откладываются до загрузки узлов
+def load_beam_from_json_stream(filename: str, beam: Beam, chunk_size: int = STREAM_CHUNK_SIZE):
+    beam.clear()
+    # Элементы из файла регистрируют свои ID в реестре загружаемой балки,
+    # поэтому несколько моделей можно загружать одновременно
+    with open(filename, "r", encoding="utf-8") as f, beam.ids.activate():
+        stream = JSONStream(f, chunk_size)
+        id_node_map = None
+        pending_segments, pending_hinges = [], []
+        has_segments = False
+
+        for key in stream.keys():
+            if key == 'nodes':
+                id_node_map = {}
+                for node_data in stream.items():
+                    id_node_map[node_data['id']] = beam.add_node(node_from_dict(node_data))
+            elif key == 'segments':
+                has_segments = True
+                for segment_data in stream.items():
+                    if id_node_map is None:
+                        pending_segments.append(segment_data)
+                    else:
+                        beam.add_segment(segment_from_dict(segment_data, id_node_map))
+            elif key == 'hinges':
+                for hinge_data in stream.items():
+                    if id_node_map is None:
+                        pending_hinges.append(hinge_data)
+                    else:
+                        hinge_from_dict(hinge_data, id_node_map)
+            else:
+                stream.value()
+
+        if id_node_map is None:
+            raise KeyError('nodes')
+        if not has_segments:
+            raise KeyError('segments')
+        for hinge_data in pending_hinges:
+            hinge_from_dict(hinge_data, id_node_map)
+        for segment_data in pending_segments:
+            beam.add_segment(segment_from_dict(segment_data, id_node_map))
+
+
+# Словарь модели (как в beam_to_dict) -> столбцы. Все ID сохраняются, поэтому обратное
+# преобразование arrays_to_dict возвращает равный исходному словарь
+def dict_to_arrays(data: dict) -> dict[str, np.ndarray]:
+    nodes, segments = data['nodes'], data['segments']
+    supported = [(index, node['support']) for index, node in enumerate(nodes) if node['support']]
+    supports = [support for _, support in supported]
+    forces = [(index, force) for index, segment in enumerate(segments) for force in segment['forces']]
+    torques = [(index, torque) for index, segment in enumerate(segments) for torque in segment['torques']]
+
+    def table(rows, columns, dtype=float, width=None):
+        array = np.array([[row[column] for column in columns] for row in rows], dtype=dtype)
+        return array.reshape(len(rows), width or len(columns))
+
+    arrays = {
+        'node_id': np.array([node['id'] for node in nodes], dtype=np.int64),
+        'node_xy': table(nodes, ('x', 'y')),
+        'node_hinge_id': np.array([node['hinge_id'] or 0 for node in nodes], dtype=np.int64),
+        'node_has_hinge': np.array([node['hinge_id'] is not None for node in nodes], dtype=bool),
+
+        'support_node': np.array([index for index, _ in supported], dtype=np.int64),
+        'support_id': np.array([support['id'] for support in supports], dtype=np.int64),
+        'support_type': np.array([support['type'] for support in supports], dtype=np.int8),
+        'support_angle': np.array([support['angle'] for support in supports], dtype=float),
+        'support_force_id': np.array([support['force']['id'] for support in supports], dtype=np.int64),
+        'support_force': table([support['force'] for support in supports], ('value', 'angle', 'node1_dist', 'length')),
+        'support_force_unknown': table([support['force'] for support in supports], ('unknown_x', 'unknown_y'), bool),
+        'support_torque_id': np.array([support['torque']['id'] for support in supports], dtype=np.int64),
+        'support_torque': table([support['torque'] for support in supports], ('value', 'node1_dist')),
+        'support_torque_unknown': np.array([support['torque']['unknown'] for support in supports], dtype=bool),
+
+        'segment_id': np.array([segment['id'] for segment in segments], dtype=np.int64),
+        'segment_node_ids': table(segments, ('node1_id', 'node2_id'), np.int64),
+
+        'force_segment': np.array([index for index, _ in forces], dtype=np.int64),
+        'force_id': np.array([force['id'] for _, force in forces], dtype=np.int64),
+        'force': table([force for _, force in forces], ('value', 'angle', 'node1_dist', 'length')),
+        'force_unknown': np.array([force['unknown'] for _, force in forces], dtype=bool),
+
+        'torque_segment': np.array([index for index, _ in torques], dtype=np.int64),
+        'torque_id': np.array([torque['id'] for _, torque in torques], dtype=np.int64),
+        'torque': table([torque for _, torque in torques], ('value', 'node1_dist')),
+        'torque_unknown': np.array([torque['unknown'] for _, torque in torques], dtype=bool),
+    }
+
+    # Старые файлы без списка шарниров так и остаются без него
     if 'hinges' in data:
-        for h in data['hinges']:
-            hinge = Hinge(custom_id=h['id'])
-            hinge_map[hinge.id] = hinge
-            for node_id in h['node_ids']:
-                node = id_node_map[node_id]
-                node.hinge = hinge
-                #hinge.assign_body(beam)
-
-    for segment_data in data['segments']:
-        node1 = id_node_map[segment_data['node1_id']]
-        node2 = id_node_map[segment_data['node2_id']]
-        segment = BeamSegment(node1, node2, custom_id=segment_data['id'])
-
-        for f in segment_data['forces']:
-            force = Force(
-                f['value'], f['angle'], f['node1_dist'],
-                f['length'], f['unknown'], custom_id=f['id']
-            )
-            segment.add_force(force)
-
-        for t in segment_data['torques']:
-            torque = Torque(
-                t['value'], t['node1_dist'], t['unknown'], custom_id=t['id']
-            )
-            segment.add_torque(torque)
-
-        beam.add_segment(segment)
+        hinges = data['hinges']
+        arrays['hinge_id'] = np.array([hinge['id'] for hinge in hinges], dtype=np.int64)
+        arrays['hinge_node_ptr'] = np.cumsum([0] + [len(hinge['node_ids']) for hinge in hinges], dtype=np.int64)
+        arrays['hinge_node_ids'] = np.array([node_id for hinge in hinges for node_id in hinge['node_ids']],
+                                            dtype=np.int64)
+    return arrays
+
+
+# Столбцы -> словарь модели в том виде, в каком его пишет beam_to_dict
+def arrays_to_dict(arrays: dict[str, np.ndarray]) -> dict:
+    nodes = [
+        {'id': node_id, 'x': x, 'y': y, 'support': None, 'hinge_id': hinge_id if has_hinge else None}
+        for node_id, (x, y), hinge_id, has_hinge in zip(
+            arrays['node_id'].tolist(), arrays['node_xy'].tolist(),
+            arrays['node_hinge_id'].tolist(), arrays['node_has_hinge'].tolist())
+    ]
+    for (index, support_id, support_type, angle, force_id, (value, force_angle, node1_dist, length),
+         (unknown_x, unknown_y), torque_id, (torque, torque_dist), torque_unknown) in zip(
+            arrays['support_node'].tolist(), arrays['support_id'].tolist(), arrays['support_type'].tolist(),
+            arrays['support_angle'].tolist(), arrays['support_force_id'].tolist(), arrays['support_force'].tolist(),
+            arrays['support_force_unknown'].tolist(), arrays['support_torque_id'].tolist(),
+            arrays['support_torque'].tolist(), arrays['support_torque_unknown'].tolist()):
+        nodes[index]['support'] = {
+            'id': support_id,
+            'type': support_type,
+            'angle': angle,
+            'force': {'id': force_id, 'value': value, 'angle': force_angle, 'node1_dist': node1_dist,
+                      'length': length, 'unknown_x': unknown_x, 'unknown_y': unknown_y},
+            'torque': {'id': torque_id, 'value': torque, 'node1_dist': torque_dist, 'unknown': torque_unknown}
+        }
+
+    segments = [
+        {'id': segment_id, 'node1_id': node1_id, 'node2_id': node2_id, 'forces': [], 'torques': []}
+        for segment_id, (node1_id, node2_id) in zip(arrays['segment_id'].tolist(), arrays['segment_node_ids'].tolist())
+    ]
+    for index, force_id, (value, angle, node1_dist, length), unknown in zip(
+            arrays['force_segment'].tolist(), arrays['force_id'].tolist(),
+            arrays['force'].tolist(), arrays['force_unknown'].tolist()):
+        segments[index]['forces'].append({'id': force_id, 'value': value, 'angle': angle,
+                                          'node1_dist': node1_dist, 'length': length, 'unknown': unknown})
+    for index, torque_id, (value, node1_dist), unknown in zip(
+            arrays['torque_segment'].tolist(), arrays['torque_id'].tolist(),
+            arrays['torque'].tolist(), arrays['torque_unknown'].tolist()):
+        segments[index]['torques'].append({'id': torque_id, 'value': value, 'node1_dist': node1_dist,
+                                           'unknown': unknown})
+
+    data = {'nodes': nodes, 'segments': segments}
+    if 'hinge_id' in arrays:
+        ptr, node_ids = arrays['hinge_node_ptr'].tolist(), arrays['hinge_node_ids'].tolist()
+        data['hinges'] = [{'id': hinge_id, 'node_ids': node_ids[ptr[i]:ptr[i + 1]]}
+                          for i, hinge_id in enumerate(arrays['hinge_id'].tolist())]
+    return data
+
+
+def _aligned(size: int) -> int:
+    return -(-size // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+
+
+def write_beam_arrays(arrays: dict[str, np.ndarray], filename: str):
+    specs, offset = {}, 0
+    contiguous = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+        contiguous[name] = array
+        specs[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset = _aligned(offset + array.nbytes)
+
+    descriptor = json.dumps({'arrays': specs}).encode('utf-8')
+    header = BINARY_MAGIC + struct.pack('<II', BINARY_VERSION, len(descriptor)) + descriptor
+    with open(filename, "wb") as f:
+        f.write(header.ljust(_aligned(len(header)), b'\0'))
+        for name, array in contiguous.items():
+            f.write(array.tobytes())
+            f.write(b'\0' * (_aligned(array.nbytes) - array.nbytes))
+
+
+# Массивы двоичного файла. При mmap=True это представления одного np.memmap только
+# для чтения: данные подгружаются с диска по мере обращения к ним
+def read_beam_arrays(filename: str, mmap: bool = True) -> dict[str, np.ndarray]:
+    prefix_size = len(BINARY_MAGIC) + 8
+    with open(filename, "rb") as f:
+        prefix = f.read(prefix_size)
+        if len(prefix) < prefix_size or not prefix.startswith(BINARY_MAGIC):
+            raise FileFormatError("Файл не является двоичным файлом балки!")
+        version, descriptor_size = struct.unpack('<II', prefix[len(BINARY_MAGIC):])
+        if not 1 <= version <= BINARY_VERSION:
+            raise FileFormatError(f"Версия формата {version} не поддерживается!")
+        raw_descriptor = f.read(descriptor_size)
+        if len(raw_descriptor) < descriptor_size:
+            raise FileFormatError("Двоичный файл балки повреждён!")
+        try:
+            descriptor = json.loads(raw_descriptor.decode('utf-8'))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise FileFormatError("Двоичный файл балки повреждён!") from e
+
+    data_start = _aligned(prefix_size + descriptor_size)
+    buffer = np.memmap(filename, dtype=np.uint8, mode='r') if mmap else np.fromfile(filename, dtype=np.uint8)
+    arrays = {}
+    for name, spec in descriptor['arrays'].items():
+        dtype, shape = np.dtype(spec['dtype']), tuple(spec['shape'])
+        start = data_start + spec['offset']
+        end = start + dtype.itemsize * int(np.prod(shape))
+        if end > len(buffer):
+            raise FileFormatError("Двоичный файл балки повреждён!")
+        arrays[name] = buffer[start:end].view(dtype).reshape(shape)
+    return arrays
+
+
+# Строит балку по столбцам двоичного файла: объекты создаются из списков значений,
+# без промежуточного словаря на каждый элемент
+def beam_from_arrays(arrays: dict[str, np.ndarray], beam: Beam):
+    beam.clear()
+    with beam.ids.activate():
+        nodes = [Node(x, y, custom_id=node_id)
+                 for node_id, (x, y) in zip(arrays['node_id'].tolist(), arrays['node_xy'].tolist())]
+
+        for (index, support_id, support_type, angle, force_id, (value, _, _, _), (unknown_x, unknown_y),
+             torque_id, (torque, _), torque_unknown) in zip(
+                arrays['support_node'].tolist(), arrays['support_id'].tolist(), arrays['support_type'].tolist(),
+                arrays['support_angle'].tolist(), arrays['support_force_id'].tolist(),
+                arrays['support_force'].tolist(), arrays['support_force_unknown'].tolist(),
+                arrays['support_torque_id'].tolist(), arrays['support_torque'].tolist(),
+                arrays['support_torque_unknown'].tolist()):
+            support = Support(Support.Type(support_type), angle, value, 0, torque, unknown_x, unknown_y,
+                              torque_unknown, custom_id=support_id, is_new=False)
+            support.force.id = force_id
+            support.torque.id = torque_id
+            nodes[index].add_support(support)
+
+        # Узлы и сегменты добавляются в балку одним вызовом Beam.extend. Слияние совпадающих
+        # узлов и отбрасывание повторных сегментов — те же, что у add_node и add_segment
+        kept, node_of = merge_points(arrays['node_xy'], beam.tolerance)
+        node_position = dict(zip(arrays['node_id'].tolist(), range(len(nodes))))
+        id_node_map = {node_id: nodes[kept[node_of[position]]] for node_id, position in node_position.items()}
+        nodes = [nodes[i] for i in kept.tolist()]
+
+        if 'hinge_id' in arrays:
+            ptr, node_ids = arrays['hinge_node_ptr'].tolist(), arrays['hinge_node_ids'].tolist()
+            for i, hinge_id in enumerate(arrays['hinge_id'].tolist()):
+                hinge = Hinge(custom_id=hinge_id)
+                for node_id in node_ids[ptr[i]:ptr[i + 1]]:
+                    id_node_map[node_id].hinge = hinge
+
+        ends = node_of[[[node_position[node_id] for node_id in pair]
+                        for pair in arrays['segment_node_ids'].tolist()]].reshape(-1, 2)
+        if np.any(ends[:, 0] == ends[:, 1]):
+            raise DotBeamError("Балка не может начинаться и заканчиваться в одной точке!")
+        lengths = np.hypot(*(arrays['node_xy'][kept[ends[:, 0]]] - arrays['node_xy'][kept[ends[:, 1]]]).T)
+        if np.any(arrays['force'][:, 2] > lengths[arrays['force_segment']]) \
+                or np.any(arrays['torque'][:, 1] > lengths[arrays['torque_segment']]):
+            raise HighDistanceError("Отступ не может быть больше длины сегмента!")
+
+        segments = [BeamSegment(nodes[i], nodes[j], custom_id=segment_id)
+                    for segment_id, (i, j) in zip(arrays['segment_id'].tolist(), ends.tolist())]
+        # Отступы уже проверены, поэтому нагрузки добавляются в списки напрямую
+        for index, force_id, (value, angle, node1_dist, length), unknown in zip(
+                arrays['force_segment'].tolist(), arrays['force_id'].tolist(),
+                arrays['force'].tolist(), arrays['force_unknown'].tolist()):
+            segments[index].forces.append(Force(value, angle, node1_dist, length, unknown, custom_id=force_id))
+        for index, torque_id, (value, node1_dist), unknown in zip(
+                arrays['torque_segment'].tolist(), arrays['torque_id'].tolist(),
+                arrays['torque'].tolist(), arrays['torque_unknown'].tolist()):
+            segments[index].torques.append(Torque(value, node1_dist, unknown, custom_id=torque_id))
+
+        _, first = np.unique(np.sort(ends, axis=1), axis=0, return_index=True)
+        first = np.sort(first)  # Повторный сегмент отбрасывается вместе с нагрузками, как в add_segment
+        beam.extend(nodes, ends[first], [segments[i] for i in first.tolist()])
+
+
+# Словарь модели из файла любого формата (без построения балки)
+def read_beam_dict(filename: str) -> dict:
+    if is_binary_file(filename):
+        return arrays_to_dict(read_beam_arrays(filename))
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Перевод файла между форматами JSON и двоичным (формат результата — по расширению target)
+def convert_beam_file(source: str, target: str):
+    data = read_beam_dict(source)
+    if target.endswith(BINARY_EXTENSION):
+        write_beam_arrays(dict_to_arrays(data), target)
+    else:
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
@@ -0,0 +1,246 @@
+import numpy as np
+import scipy.sparse as sps
+import scipy.sparse.linalg as spla
+import sympy as sp
+from errors import *
+
+
+# Допустимая относительная невязка решения: всё, что больше, считаем несовместной системой
+RESIDUAL_TOLERANCE = 1e-8
+
+
+# Линейная система уравнений равновесия в структурированном виде:
+# каждая строка — словарь {индекс неизвестной: коэффициент}, известные нагрузки
+# перенесены в правую часть. Любой способ решения читает её без разбора строк.
+# Вклад каждой нагрузки запоминается отдельно (loads, terms), чтобы правую
+# часть можно было пересчитать для других значений нагрузок без сборки заново.
+# Слагаемые нагрузок хранятся столбцами NumPy (владелец, строка, нагрузка, коэффициент)
+# и помечены объектом-владельцем (сегментом или узлом), поэтому нагрузки изменённых
+# сегментов можно заменить, не трогая остальные.
+class LinearSystem:
+    def __init__(self):
+        self.unknowns: list[str] = []
+        self.index: dict[str, int] = {}
+        self.rows: list[dict[int, float]] = []
+        self.rhs: list[float] = []  # Правая часть без учёта нагрузок
+        self.loads: list = []
+        self.load_index: dict = {}
+        self.owner_codes: dict = {}  # Владелец -> его номер в столбце владельцев
+        self._terms = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                       np.empty(0, dtype=np.int64), np.empty(0))
+        self._pending: list = []  # Добавленные, но ещё не слитые в _terms части столбцов
+        self.groups: dict[object, tuple[int, ...]] = {}  # Строки уравнений, к которым относится владелец
+
+    # Возвращает индекс неизвестной, регистрируя её при первом упоминании
+    def unknown(self, name: str) -> int:
+        if name not in self.index:
+            self.index[name] = len(self.unknowns)
+            self.unknowns.append(name)
+        return self.index[name]
+
+    # Начинает новое уравнение и возвращает номер его строки
+    def add_row(self) -> int:
+        self.rows.append({})
+        self.rhs.append(0.0)
+        return len(self.rows) - 1
+
+    # Добавляет слагаемое coefficient * name в левую часть уравнения
+    def add_term(self, row: int, name: str, coefficient: float = 1.0):
+        column = self.unknown(name)
+        self.rows[row][column] = self.rows[row].get(column, 0.0) + coefficient
+
+    def load_column(self, load) -> int:
+        if load not in self.load_index:
+            self.load_index[load] = len(self.loads)
+            self.loads.append(load)
+        return self.load_index[load]
+
+    # Добавляет известное слагаемое coefficient * load.value от силы или момента.
+    # Значение нагрузки читается при каждом расчёте правой части, а не запоминается
+    def add_load(self, row: int, load, coefficient: float = 1.0, owner=None):
+        self.add_loads([[row]], [[coefficient]], [load], [owner])
+
+    # Добавляет слагаемые многих нагрузок сразу: i-я нагрузка (владелец owners[i])
+    # входит в строки rows[i] с коэффициентами coefficients[i] (массивы (нагрузки, k))
+    def add_loads(self, rows, coefficients, loads: list, owners: list):
+        rows = np.asarray(rows, dtype=np.int64).reshape(len(loads), -1)
+        coefficients = np.asarray(coefficients, dtype=float).reshape(rows.shape)
+        count = rows.shape[1]
+        columns = np.fromiter((self.load_column(load) for load in loads), dtype=np.int64, count=len(loads))
+        codes = np.fromiter((self.owner_codes.setdefault(owner, len(self.owner_codes)) for owner in owners),
+                            dtype=np.int64, count=len(owners))
+        self._pending.append((np.repeat(codes, count), rows.ravel(), np.repeat(columns, count), coefficients.ravel()))
+
+    # Все слагаемые нагрузок: столбцы (владелец, строка, нагрузка, коэффициент)
+    def terms(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        if self._pending:
+            self._terms = tuple(np.concatenate([column, *(part[i] for part in self._pending)])
+                                for i, column in enumerate(self._terms))
+            self._pending.clear()
+        return self._terms
+
+    # Убирает все слагаемые нагрузок владельцев (перед их повторным добавлением) вместе
+    # с самими нагрузками: у каждой нагрузки один владелец, поэтому её столбец освобождается.
+    # На освободившиеся места переносятся последние столбцы, так что остальные номера
+    # не меняются и стоимость не зависит от общего числа нагрузок
+    def clear_loads(self, *owners):
+        codes = [self.owner_codes[owner] for owner in owners if owner in self.owner_codes]
+        if not codes:
+            return
+        owner_column, rows, columns, coefficients = self.terms()
+        removed = np.isin(owner_column, codes)
+        dead = set(np.unique(columns[removed]).tolist())
+        keep = ~removed
+        owner_column, rows, columns, coefficients = (column[keep] for column in self._terms)
+
+        if dead:
+            for column in dead:
+                del self.load_index[self.loads[column]]
+            count = len(self.loads) - len(dead)
+            holes = sorted(column for column in dead if column < count)
+            movers = [column for column in range(count, len(self.loads)) if column not in dead]
+            remap = np.arange(len(self.loads))
+            for hole, mover in zip(holes, movers):
+                self.loads[hole] = self.loads[mover]
+                self.load_index[self.loads[hole]] = hole
+                remap[mover] = hole
+            del self.loads[count:]
+            if movers:
+                columns = remap[columns]
+        self._terms = owner_column, rows, columns, coefficients
+
+    def load_values(self) -> np.ndarray:
+        return np.array([load.value for load in self.loads], dtype=float)
+
+    # Матрица вклада нагрузок в правую часть: rhs = self.rhs + load_matrix @ values
+    def load_matrix(self) -> sps.csr_matrix:
+        _, rows, columns, coefficients = self.terms()
+        return sps.csr_matrix((-coefficients, (rows, columns)), shape=(len(self.rows), len(self.loads)))
+
+    def matrix(self) -> sps.csr_matrix:
+        rows, cols, values = [], [], []
+        for row, coefficients in enumerate(self.rows):
+            for column, coefficient in coefficients.items():
+                rows.append(row)
+                cols.append(column)
+                values.append(coefficient)
+        return sps.csr_matrix((values, (rows, cols)), shape=(len(self.rows), len(self.unknowns)))
+
+    # Правая часть при текущих значениях нагрузок
+    def rhs_vector(self) -> np.ndarray:
+        return np.array(self.rhs, dtype=float) + self.load_matrix() @ self.load_values()
+
+    # Уравнения в виде sympy с точными рациональными коэффициентами
+    # Строка без неизвестных (например, равновесие по X без горизонтальных сил) в систему
+    # не попадает: sympy не решает систему с невычисленным Eq(0, 0). Если же её правая часть
+    # не нулевая, уравнение невыполнимо
+    def to_sympy(self) -> tuple[list[sp.Eq], list[sp.Symbol]]:
+        symbols = [sp.Symbol(name) for name in self.unknowns]
+        eqs = []
+        for coefficients, value in zip(self.rows, self.rhs_vector().tolist()):
+            if not coefficients:
+                if abs(value) > RESIDUAL_TOLERANCE:
+                    raise UnsolvableError("Невозможно найти решение либо система подвижна!")
+                continue
+            lhs = sp.Add(*(sp.Rational(c) * symbols[i] for i, c in coefficients.items()))
+            eqs.append(sp.Eq(lhs, sp.Rational(value), evaluate=False))
+        return eqs, symbols
+
+
+# Разлагает матрицу системы один раз и возвращает функцию решения для любой правой части.
+# Квадратная система раскладывается LU, переопределённая решается методом наименьших
+# квадратов через нормальные уравнения. Вырожденность означает, что система подвижна.
+def factorize(matrix: sps.spmatrix):
+    rows, cols = matrix.shape
+    if rows < cols:
+        raise TooManyUnknownsError("Слишком много неизвестных!")
+
+    matrix = sps.csc_matrix(matrix)
+    normal = matrix if rows == cols else sps.csc_matrix(matrix.T @ matrix)
+
+    try:
+        lu = spla.splu(normal)
+    except RuntimeError:
+        raise UnsolvableError("Невозможно найти решение либо система подвижна!")
+
+    def solve(rhs: np.ndarray) -> np.ndarray:
+        solution = lu.solve(rhs if rows == cols else matrix.T @ rhs)
+        residual = matrix @ solution - rhs
+        # rhs может содержать сразу несколько правых частей (по столбцам), невязка проверяется для каждой
+        scale = np.maximum(1.0, np.max(np.abs(rhs), axis=0, initial=0))
+        if not np.all(np.isfinite(solution)) or np.any(np.max(np.abs(residual), axis=0, initial=0) > RESIDUAL_TOLERANCE * scale):
+            raise UnsolvableError("Невозможно найти решение либо система подвижна!")
+        return solution
+
+    return solve
+
+
+# Численное решение: разреженная система только над неизвестными реакциями.
+# Готовое разложение левой части (factor) можно передать, чтобы не раскладывать заново
+def solve_numeric(system: LinearSystem, factor=None) -> dict[str, float]:
+    if factor is None:
+        factor = factorize(system.matrix())
+    solution = factor(system.rhs_vector())
+    return dict(zip(system.unknowns, solution.tolist()))
+
+
+# Численный расчёт, подготовленный для другого потока: матрица и правая часть уже взяты
+# из модели (Beam.solve_job), поэтому compute к балке и нагрузкам не обращается.
+# Если разложения ещё нет, его строит compute, а Beam.finish_job сохраняет его в кэш балки
+class SolveJob:
+    def __init__(self, system: LinearSystem, factor=None):
+        self.system = system  # Только для сверки в Beam.finish_job; compute систему не читает
+        self.unknowns: list[str] = list(system.unknowns)
+        self.rhs: np.ndarray = system.rhs_vector()
+        self.factor = factor
+        self.matrix = system.matrix() if factor is None else None
+
+    def compute(self) -> dict[str, float]:
+        if self.factor is None:
+            self.factor = factorize(self.matrix)
+        return dict(zip(self.unknowns, self.factor(self.rhs).tolist()))
+
+
+# Точное решение через sympy (удобно для проверки численного результата)
+def solve_symbolic(system: LinearSystem) -> dict[str, float]:
+    eqs, symbols = system.to_sympy()
+    solution = sp.solve(eqs, symbols)
+
+    if len(solution) < 1:
+        raise UnsolvableError("Невозможно найти решение либо система подвижна!")
+
+    try:
+        return {str(k): float(v) for k, v in solution.items()}
+    except Exception:
+        raise UnsolvableError("Невозможно найти решение либо система подвижна!")
+
+
+# Решение одной и той же конструкции для многих загружений:
+# матрица раскладывается один раз, каждое загружение — только обратная подстановка
+class LoadCaseSolver:
+    def __init__(self, system: LinearSystem, factor=None):
+        self.unknowns: list[str] = list(system.unknowns)
+        self.loads: list = list(system.loads)
+        self.load_index: dict = dict(system.load_index)
+        self.load_matrix = system.load_matrix()
+        self.values = system.load_values()
+        self.rhs = system.rhs_vector()
+        self._solve = factor if factor is not None else factorize(system.matrix())
+
+    # Значения нагрузок для каждого загружения: столбец на загружение
+    def load_values(self, load_cases: list[dict]) -> np.ndarray:
+        values = np.repeat(self.values[:, None], len(load_cases), axis=1)
+        for case, load_case in enumerate(load_cases):
+            for load, value in load_case.items():
+                if load not in self.load_index:
+                    raise NonExistentError(f"Нагрузка {load} не приложена к балке!")
+                values[self.load_index[load], case] = value
+        return values
+
+    # Возвращает массив реакций: строка — загружение, столбец — неизвестная из unknowns
+    def solve(self, load_cases: list[dict]) -> np.ndarray:
+        if len(load_cases) == 0:
+            return np.zeros((0, len(self.unknowns)))
+        base = self.rhs - self.load_matrix @ self.values
+        rhs = base[:, None] + self.load_matrix @ self.load_values(load_cases)
+        return self._solve(rhs).T
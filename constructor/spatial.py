@@ -0,0 +1,121 @@
+import math
+import numpy as np
+
+
+# Равномерная сетка (пространственный хэш) для быстрого поиска объектов по координатам.
+# Плоскость делится на квадратные ячейки размера cell_size; объект хранится в ячейках,
+# которые покрывает его точка или прямоугольник, поэтому поиск проверяет лишь несколько
+# ячеек, а не все объекты. Объекты различаются по identity (id()), так что их
+# собственный __hash__ не важен.
+class SpatialHash:
+    # Прямоугольник, покрывающий больше ячеек, хранится в отдельном списке large
+    # и проверяется при каждом запросе: так длинные элементы не раздувают сетку
+    MAX_CELLS = 64
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("Размер ячейки должен быть положительным!")
+        self.cell_size: float = cell_size
+        self.cells: dict[tuple[int, int], list] = {}
+        self.large: list = []
+        self._items: dict[int, tuple[object, tuple, tuple[float, float, float, float]]] = {}
+
+    def cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def insert(self, item, x: float, y: float):
+        self.insert_box(item, x, y, x, y)
+
+    # Добавляет объект, занимающий прямоугольник (x1, y1)–(x2, y2)
+    def insert_box(self, item, x1: float, y1: float, x2: float, y2: float):
+        if id(item) in self._items:
+            self.remove(item)
+        box = min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+        (cx1, cy1), (cx2, cy2) = self.cell(box[0], box[1]), self.cell(box[2], box[3])
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.MAX_CELLS:
+            keys = ()
+            self.large.append(item)
+        else:
+            keys = tuple((cx, cy) for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1))
+            for key in keys:
+                self.cells.setdefault(key, []).append(item)
+        self._items[id(item)] = (item, keys, box)
+
+    # Добавляет много точечных объектов сразу: ячейки считаются одним проходом NumPy
+    def insert_many(self, items, xs, ys):
+        xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        cxs = np.floor(xs / self.cell_size).astype(np.int64).tolist()
+        cys = np.floor(ys / self.cell_size).astype(np.int64).tolist()
+        for item, x, y, key in zip(items, xs.tolist(), ys.tolist(), zip(cxs, cys)):
+            if id(item) in self._items:
+                self.remove(item)
+            self.cells.setdefault(key, []).append(item)
+            self._items[id(item)] = (item, (key,), (x, y, x, y))
+
+    def remove(self, item):
+        entry = self._items.pop(id(item), None)
+        if entry is None:
+            return
+        keys = entry[1]
+        if not keys:
+            self.large[:] = [other for other in self.large if other is not item]
+        for key in keys:
+            bucket = self.cells[key]
+            bucket[:] = [other for other in bucket if other is not item]
+            if not bucket:
+                del self.cells[key]
+
+    def clear(self):
+        self.cells.clear()
+        self.large.clear()
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return id(item) in self._items
+
+    # Объекты из ячеек, пересекающих прямоугольник, без повторов (без точной проверки)
+    def _candidates(self, x1: float, y1: float, x2: float, y2: float):
+        (cx1, cy1), (cx2, cy2) = self.cell(x1, y1), self.cell(x2, y2)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self.cells):
+            # Запрос шире заполненной части сетки — дешевле перебрать непустые ячейки
+            buckets = [bucket for (cx, cy), bucket in self.cells.items() if cx1 <= cx <= cx2 and cy1 <= cy <= cy2]
+        else:
+            buckets = [self.cells[key] for key in ((cx, cy) for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1))
+                       if key in self.cells]
+        buckets.append(self.large)
+        seen = set()
+        for bucket in buckets:
+            for item in bucket:
+                entry = self._items[id(item)]
+                if len(entry[1]) > 1:
+                    if id(item) in seen:
+                        continue
+                    seen.add(id(item))
+                yield entry
+
+    # Все объекты в радиусе radius от точки (x, y) вместе с расстояниями до них
+    # (для прямоугольника — расстояние до его ближайшей точки)
+    def nearby(self, x: float, y: float, radius: float):
+        for item, _, (x1, y1, x2, y2) in self._candidates(x - radius, y - radius, x + radius, y + radius):
+            distance = math.hypot(max(x1 - x, 0, x - x2), max(y1 - y, 0, y - y2))
+            if distance <= radius:
+                yield item, distance
+
+    # Ближайший к точке объект не дальше radius (или None)
+    def nearest(self, x: float, y: float, radius: float):
+        best, best_distance = None, math.inf
+        for item, distance in self.nearby(x, y, radius):
+            if distance < best_distance:
+                best, best_distance = item, distance
+        return best
+
+    # Все объекты, чьи точки или прямоугольники пересекают прямоугольник (x1, y1)–(x2, y2)
+    def query(self, x1: float, y1: float, x2: float, y2: float):
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        for item, _, (bx1, by1, bx2, by2) in self._candidates(x1, y1, x2, y2):
+            if bx1 <= x2 and x1 <= bx2 and by1 <= y2 and y1 <= by2:
+                yield item
@@ -1,13 +1,19 @@
+import itertools
 import json
 import math
 from enum import Enum
 import networkx as nx
-import sympy as sp
+import numpy as np
 from errors import *
-from ids import IDNumerator
+from ids import IDNumerator, IDRegistry
+from spatial import SpatialHash
+from topology import CompactTopology, GraphTopology, Numbering
+from solver import LinearSystem, LoadCaseSolver, SolveJob, factorize, solve_numeric, solve_symbolic
 
 
 class Force(IDNumerator):
+    __slots__ = ('value', 'angle', 'node1_dist', 'length', 'unknown_x', 'unknown_y')
+
     def __init__(self,
                  value: float,
                  angle: float,
@@ -42,28 +48,37 @@ class Force(IDNumerator):
             angle_deg += 360
         return magnitude, angle_deg
 
+    # Проекции силы, приходящиеся на единицу её значения (с учётом длины действия)
     @property
-    def part_x(self):
+    def unit_x(self):
         if self.angle in (0, 180):
-            return self.value * self.length * (1 if self.angle == 0 else -1)
+            return self.length * (1 if self.angle == 0 else -1)
         elif self.angle in (90, 270):
             return 0
         else:
-            return math.cos(math.radians(self.angle)) * self.value * self.length
+            return math.cos(math.radians(self.angle)) * self.length
 
     @property
-    def part_y(self):
+    def unit_y(self):
         if self.angle in (0, 180):
             return 0
         elif self.angle == 90:
-            return self.value * self.length
+            return self.length
         elif self.angle == 270:
-            return -self.value * self.length
+            return -self.length
         else:
-            return math.sin(math.radians(self.angle)) * self.value * self.length
+            return math.sin(math.radians(self.angle)) * self.length
+
+    @property
+    def part_x(self):
+        return self.value * self.unit_x
+
+    @property
+    def part_y(self):
+        return self.value * self.unit_y
 
     def __repr__(self):
-        return f"Force(value={self.value}, angle={self.angle}, node1_dist={self.node1_dist}, length={self.length}, unknown={self.unknown})"
+        return f"Force(value={self.value}, angle={self.angle}, node1_dist={self.node1_dist}, length={self.length}, unknown_x={self.unknown_x}, unknown_y={self.unknown_y})"
 
     class Type(Enum):
         OTHER = 0
@@ -83,6 +98,8 @@ class Force(IDNumerator):
 
 
 class Torque(IDNumerator):
+    __slots__ = ('value', 'node1_dist', 'unknown')
+
     def __init__(self, value: float, node1_dist: float, unknown: bool = False, custom_id: int | None = None):
         super().__init__(custom_id)
 
@@ -102,6 +119,7 @@ class Torque(IDNumerator):
 
 
 class Support(IDNumerator):
+    __slots__ = ('support_type', 'angle', 'force', 'torque')
 
     class Type(Enum):
         FIXED = 0
@@ -152,11 +170,13 @@ class Support(IDNumerator):
 
 
 class Hinge(IDNumerator):
+    __slots__ = ('bodies',)
+
     def __init__(self, custom_id: int | None = None):
         super().__init__(custom_id)
-        self.bodies: list["Beam"] = []
+        self.bodies: list["SubBeam"] = []
 
-    def assign_body(self, beam: "Beam"):
+    def assign_body(self, beam: "SubBeam"):
         if beam not in self.bodies:
             self.bodies.append(beam)
 
@@ -165,13 +185,51 @@ class Hinge(IDNumerator):
         parts = ', '.join(f'Beam#{b.id}' for b in self.bodies)
         return f"{pad}Hinge#{self.id}: bodies=[{parts}]"
 
+# Версии положения узлов: каждое создание и перемещение узла получает новый номер,
+# поэтому пара версий концов однозначно определяет геометрию сегмента
+_node_versions = itertools.count(1)
+
+
 class Node(IDNumerator):
+    __slots__ = ('x', 'y', 'version', 'owner', '_support', '_hinge')
+
     def __init__(self, x: float, y: float, custom_id: int | None = None):
         super().__init__(custom_id)
-        self.x: float = x
-        self.y: float = y
-        self.support: Support = None
-        self.hinge: Hinge = None
+        self.x: float = x  # Координаты читаются очень часто, поэтому это обычные поля;
+        self.y: float = y  # менять их следует только через move_to
+        self.version: int = next(_node_versions)
+        self.owner: "Beam" = None  # Балка, которая отслеживает изменения узла
+        self._support: Support = None
+        self._hinge: Hinge = None
+
+    # Перемещение узла меняет геометрию примыкающих сегментов: новая версия сбрасывает
+    # их кэш (BeamSegment.geometry), а балка обновляет индекс и пересобирает систему
+    def move_to(self, x: float, y: float):
+        self.x, self.y = x, y
+        self.version = next(_node_versions)
+        if self.owner is not None:
+            self.owner.node_moved(self)
+
+    # Опора и шарнир меняют состав неизвестных, поэтому их замена помечает топологию изменённой
+    @property
+    def support(self) -> Support:
+        return self._support
+
+    @support.setter
+    def support(self, support: Support):
+        self._support = support
+        if self.owner is not None:
+            self.owner.mark_dirty(self, topology=True)
+
+    @property
+    def hinge(self) -> Hinge:
+        return self._hinge
+
+    @hinge.setter
+    def hinge(self, hinge: Hinge):
+        self._hinge = hinge
+        if self.owner is not None:
+            self.owner.mark_dirty(self, topology=True)
 
     def add_support(self, support: Support):
         self.support = support
@@ -181,12 +239,6 @@ class Node(IDNumerator):
 
     def __repr__(self):
         return f"Node(coords=({self.x}, {self.y}), support={self.support})"
-
-    def __hash__(self):
-        return hash((self.x, self.y, self.id))
-
-    def __eq__(self, other):
-        return isinstance(other, Node) and self.id == other.id
     
     def pretty_print(self, indent=0):
         pad = ' ' * indent
@@ -199,26 +251,93 @@ class Node(IDNumerator):
 
 
 class BeamSegment(IDNumerator):
+    __slots__ = ('node1', 'node2', 'forces', 'torques', 'owner',
+                 '_length', '_cos', '_sin', '_version1', '_version2')
+
     def __init__(self, node1: Node, node2: Node, custom_id: int | None = None):
         super().__init__(custom_id)
         self.node1: Node = node1
         self.node2: Node = node2
         self.forces: list[Force] = []
         self.torques: list[Torque] = []
-
+        self.owner: "Beam" = None  # Балка, которая отслеживает изменения сегмента
+        self._length: float = 0.0
+        self._cos: float = 0.0
+        self._sin: float = 0.0
+        self._version1: int = 0  # Версии концов, для которых посчитаны длина и косинусы
+        self._version2: int = 0
+
+    # Известная нагрузка меняет только правую часть системы, неизвестная — её состав
     def add_force(self, force: Force):
         if force.node1_dist > self.length:
             raise HighDistanceError("Отступ не может быть больше длины сегмента!")
         self.forces.append(force)
+        if self.owner is not None:
+            self.owner.mark_dirty(self, topology=force.unknown_x or force.unknown_y)
 
     def add_torque(self, torque: Torque):
         if torque.node1_dist > self.length:
             raise HighDistanceError("Отступ не может быть больше длины сегмента!")
         self.torques.append(torque)
+        if self.owner is not None:
+            self.owner.mark_dirty(self, topology=torque.unknown)
+
+    # Удалять нагрузки нужно через эти методы, а не из списков напрямую: иначе балка
+    # не узнает об изменении и следующий расчёт возьмёт старую правую часть из кэша
+    def remove_force(self, force: Force):
+        self.forces.remove(force)
+        if self.owner is not None:
+            self.owner.mark_dirty(self, topology=force.unknown_x or force.unknown_y)
+
+    def remove_torque(self, torque: Torque):
+        self.torques.remove(torque)
+        if self.owner is not None:
+            self.owner.mark_dirty(self, topology=torque.unknown)
+
+    def clear_loads(self):
+        topology = any(f.unknown_x or f.unknown_y for f in self.forces) or any(t.unknown for t in self.torques)
+        self.forces.clear()
+        self.torques.clear()
+        if self.owner is not None:
+            self.owner.mark_dirty(self, topology=topology)
+
+    # Длина и направляющие косинусы (от node1 к node2) считаются один раз и пересчитываются,
+    # только когда сменился конец сегмента или он был перемещён (Node.move_to)
+    def _update_geometry(self):
+        node1, node2 = self.node1, self.node2
+        dx, dy = node2.x - node1.x, node2.y - node1.y
+        self._length = math.hypot(dx, dy)
+        self._cos, self._sin = (dx / self._length, dy / self._length) if self._length else (0.0, 0.0)
+        self._version1, self._version2 = node1.version, node2.version
+
+    @property
+    def length(self) -> float:
+        if self._version1 != self.node1.version or self._version2 != self.node2.version:
+            self._update_geometry()
+        return self._length
+
+    # Длина и направляющие косинусы одним вызовом — для циклов по нагрузкам сегмента
+    @property
+    def geometry(self) -> tuple[float, float, float]:
+        if self._version1 != self.node1.version or self._version2 != self.node2.version:
+            self._update_geometry()
+        return self._length, self._cos, self._sin
 
     @property
-    def length(self):
-        return math.hypot(self.node1.x - self.node2.x, self.node1.y - self.node2.y)
+    def direction(self) -> tuple[float, float]:
+        _, cos, sin = self.geometry
+        return cos, sin
+
+    # Единичная нормаль: направление, повёрнутое на 90° против часовой стрелки
+    @property
+    def normal(self) -> tuple[float, float]:
+        _, cos, sin = self.geometry
+        return -sin, cos
+
+    # Точка на расстоянии dist от node1
+    def point_at(self, dist: float) -> tuple[float, float]:
+        _, cos, sin = self.geometry
+        return self.node1.x + dist * cos, self.node1.y + dist * sin
 
     def __repr__(self):
         return f"BeamSegment(from={self.node1}, to={self.node2}, forces={self.forces}, torques={self.torques})"
@@ -233,70 +352,448 @@ class BeamSegment(IDNumerator):
         return '\n'.join(lines)
 
 
+# Добавляет в строки rows = (fx, fy, t) одного тела вклад силы, приложенной в точке (x, y).
+# Неизвестные составляющие под именами name_x/name_y попадают в левую часть системы,
+# известные — в правую как нагрузки объекта owner
+def add_force_to_system(system: LinearSystem, rows: tuple[int, int, int], name: str, force: Force,
+                        x: float, y: float, owner, with_unknowns: bool = True):
+    fx_row, fy_row, t_row = rows
+
+    if force.unknown_x:
+        if with_unknowns:
+            system.add_term(fx_row, f'{name}_x')
+            if y != 0:
+                system.add_term(t_row, f'{name}_x', -y)
+    else:
+        unit = force.unit_x
+        system.add_load(fx_row, force, unit, owner)
+        system.add_load(t_row, force, unit * -y, owner)
+
+    if force.unknown_y:
+        if with_unknowns:
+            system.add_term(fy_row, f'{name}_y')
+            if x != 0:
+                system.add_term(t_row, f'{name}_y', x)
+    else:
+        unit = force.unit_y
+        system.add_load(fy_row, force, unit, owner)
+        system.add_load(t_row, force, unit * x, owner)
+
+
+# Проекции сил на единицу значения для массивов углов и длин действия —
+# то же, что Force.unit_x/unit_y (углы, кратные 90°, дают точные 0 и ±length)
+def force_units(angles: np.ndarray, lengths: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    radians = np.radians(angles)
+    unit_x = np.select([angles == 0, angles == 180, (angles == 90) | (angles == 270)],
+                       [1.0, -1.0, 0.0], np.cos(radians)) * lengths
+    unit_y = np.select([(angles == 0) | (angles == 180), angles == 90, angles == 270],
+                       [0.0, 1.0, -1.0], np.sin(radians)) * lengths
+    return unit_x, unit_y
+
+
+# Добавляет в систему силы и моменты, приложенные к сегментам: items — пары (rows, сегмент).
+# Известные нагрузки всех сегментов собираются в одну столбцовую таблицу, и точки
+# приложения, проекции и плечи моментов считаются одним проходом NumPy.
+# Силы с неизвестными составляющими (их мало) добавляются по одной через add_force_to_system.
+# При with_unknowns=False пересчитываются только известные нагрузки (правая часть)
+def add_segments_to_system(system: LinearSystem, items: list, with_unknowns: bool = True):
+    geometry = []  # На сегмент: x1, y1, cos, sin (BeamSegment.geometry), fx_row, fy_row, t_row
+    force_segments, forces = [], []
+    torque_segments, torques = [], []
+    for position, (rows, segment) in enumerate(items):
+        _, cos, sin = segment.geometry
+        geometry.append((segment.node1.x, segment.node1.y, cos, sin, *rows))
+        for force in segment.forces:
+            if force.unknown_x or force.unknown_y:
+                add_force_to_system(system, rows, f'segment_{segment.id}_force_{force.id}', force,
+                                    *segment.point_at(force.node1_dist), segment, with_unknowns)
+            else:
+                force_segments.append(position)
+                forces.append(force)
+        for torque in segment.torques:
+            if torque.unknown:
+                if with_unknowns:
+                    system.add_term(rows[2], f'segment_{segment.id}_torque_{torque.id}')
+            else:
+                torque_segments.append(position)
+                torques.append(torque)
+
+    geometry = np.array(geometry, dtype=float).reshape(-1, 7)
+    if forces:
+        x1, y1, cos, sin, fx_row, fy_row, t_row = geometry[force_segments].T
+        table = np.array([(force.node1_dist, force.angle, force.length) for force in forces], dtype=float)
+        x, y = x1 + table[:, 0] * cos, y1 + table[:, 0] * sin  # Точки приложения
+        unit_x, unit_y = force_units(table[:, 1], table[:, 2])
+        system.add_loads(np.column_stack([fx_row, t_row, fy_row, t_row]),
+                         np.column_stack([unit_x, unit_x * -y, unit_y, unit_y * x]),
+                         forces, [items[position][1] for position in force_segments])
+    if torques:
+        system.add_loads(geometry[torque_segments, 6], np.ones(len(torques)),
+                         torques, [items[position][1] for position in torque_segments])
+
+
+# Слияние точек по правилу Beam.add_node: точки перебираются по порядку, и точка не дальше
+# tolerance от уже оставленной сливается с ближайшей из них. Сливаться могут лишь точки
+# в соседних ячейках размера tolerance, поэтому по порядку (через SpatialHash, как в
+# add_node) перебираются только они, а одиночные точки остаются как есть.
+# Возвращает индексы оставленных точек и для каждой точки — номер её среди оставленных
+def merge_points(coords: np.ndarray, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    cells = np.floor(coords / tolerance).astype(np.int64).reshape(-1, 2)
+    # Номер ячейки одним числом: ранги координат ячеек (с соседними) по x и по y
+    _, x_rank = np.unique(np.concatenate([cells[:, 0] - 1, cells[:, 0], cells[:, 0] + 1]), return_inverse=True)
+    _, y_rank = np.unique(np.concatenate([cells[:, 1] - 1, cells[:, 1], cells[:, 1] + 1]), return_inverse=True)
+    x_rank, y_rank = x_rank.reshape(3, -1), y_rank.reshape(3, -1)
+    keys = x_rank[:, None] * (y_rank.max(initial=0) + 1) + y_rank[None, :]  # [dx + 1, dy + 1, точка]
+
+    occupied, inverse, counts = np.unique(keys[1, 1], return_inverse=True, return_counts=True)
+    crowded = counts[inverse] > 1
+    neighbors = np.delete(keys.reshape(9, -1), 4, axis=0)  # Восемь соседних ячеек
+    crowded |= np.isin(neighbors, occupied).any(axis=0)
+
+    representative = np.arange(len(coords))
+    index = SpatialHash(tolerance)
+    for i, (x, y) in zip(np.flatnonzero(crowded).tolist(), coords[crowded].tolist()):
+        nearest = index.nearest(x, y, tolerance)
+        if nearest is None:
+            index.insert(i, x, y)
+        else:
+            representative[i] = nearest
+
+    kept = np.flatnonzero(representative == np.arange(len(coords)))
+    rank = np.empty(len(coords), dtype=np.int64)
+    rank[kept] = np.arange(len(kept))
+    return kept, rank[representative]
+
+
+# Тело между шарнирами: часть балки со своими уравнениями равновесия.
+# Хранит только списки узлов и сегментов, без собственного графа и ID —
+# номер тела (id) задаётся порядком при разбиении балки
+class SubBeam:
+    def __init__(self, body_id: int):
+        self.id: int = body_id
+        self.nodes: list[Node] = []
+        self.segments: list[BeamSegment] = []
+
+    def get_nodes(self):
+        return self.nodes
+
+    def get_segments(self):
+        return self.segments
+
+    # Добавляет в систему уравнения равновесия этого тела: суммы проекций сил на оси X и Y,
+    # сумму моментов относительно начала координат и (для первого тела шарнира)
+    # условия совместности шарнирных реакций
+    # Если передан список segment_rows, нагрузки сегментов не добавляются сразу, а пары
+    # (rows, сегмент) дописываются в него — чтобы добавить нагрузки всех тел одним проходом
+    def build_equations(self, system: LinearSystem, hinge_bodies: dict["Hinge", list["SubBeam"]],
+                        segment_rows: list | None = None):
+        fx_row, fy_row, t_row = rows = system.add_row(), system.add_row(), system.add_row()
+
+        for node in self.get_nodes():
+            if node.support:
+                nid = f'node_{node.id}'
+                add_force_to_system(system, rows, nid, node.support.force, node.x, node.y, node)
+                if node.support.torque.unknown:
+                    system.add_term(t_row, f'{nid}_torque')
+                else:
+                    system.add_load(t_row, node.support.torque, owner=node)
+                system.groups[node] = rows
+
+            elif node.hinge:
+                hinge = node.hinge
+                bodies = hinge_bodies.get(hinge, [])
+                if self not in bodies:
+                    continue
+
+                prefix = f'hinge_{hinge.id}_for_beam_{self.id}'
+                name_x = f'{prefix}_force_x'
+                name_y = f'{prefix}_force_y'
+
+                system.add_term(fx_row, name_x)
+                system.add_term(fy_row, name_y)
+                if node.y != 0:
+                    system.add_term(t_row, name_x, -node.y)
+                if node.x != 0:
+                    system.add_term(t_row, name_y, node.x)
+
+                if bodies[0] is self:
+                    hx_row, hy_row = system.add_row(), system.add_row()
+                    for body in bodies:
+                        system.add_term(hx_row, f'hinge_{hinge.id}_for_beam_{body.id}_force_x')
+                        system.add_term(hy_row, f'hinge_{hinge.id}_for_beam_{body.id}_force_y')
+
+        items = [(rows, segment) for segment in self.get_segments()]
+        for _, segment in items:
+            system.groups[segment] = rows
+        if segment_rows is None:
+            add_segments_to_system(system, items)
+        else:
+            segment_rows.extend(items)
+
+    def __repr__(self):
+        return f"SubBeam(id={self.id}, segments={[segment.id for segment in self.segments]})"
+
+    def pretty_print(self, indent=0):
+        pad = ' ' * indent
+        lines = [f"{pad}Beam#{self.id}:"]
+        lines.append(f"{pad} Nodes:")
+        for node in self.nodes:
+            lines.append(node.pretty_print(indent + 2))
+        lines.append(f"{pad} Segments:")
+        for segment in self.segments:
+            lines.append(segment.pretty_print(indent + 2))
+        return '\n'.join(lines)
+
+
 class Beam(IDNumerator):
-    def __init__(self, segments: list[BeamSegment] = [], custom_id: int | None = None):
+    # tolerance — расстояние, в пределах которого узлы считаются совпадающими и сливаются;
+    # compact=True хранит топологию в массивах (CompactTopology) — для рам с десятками тысяч элементов
+    def __init__(self, segments: list[BeamSegment] = [], custom_id: int | None = None, tolerance: float = 1e-9,
+                 compact: bool = False):
         super().__init__(custom_id)
-        self.graph = nx.Graph()
+        self.ids = IDRegistry()  # Реестр ID элементов этой балки (см. reassign_ids)
+        self.topology = CompactTopology() if compact else GraphTopology()
+        # Номера узлов и сегментов, которые показывает интерфейс и по которым к ним обращаются диалоги
+        self.node_numbering = Numbering()
+        self.segment_numbering = Numbering()
+        self.tolerance: float = tolerance
+        self._node_index = SpatialHash(tolerance)  # Индекс узлов по координатам
+        self.dirty: set = set()  # Объекты, изменённые после последней сборки системы
+        self.topology_version: int = 0  # Растёт при каждом изменении состава неизвестных
+        self._decomposition = None  # Кэш разбиения шарнирами для версии _decomposition_version
+        self._decomposition_version: int = -1
+        self._assembly = None  # Кэш сборки: (подбалки, система) для версии _assembly_version
+        self._assembly_version: int = -1
+        self._factorization = None
         for s in segments:
             self.add_segment(s)
 
-    def add_node(self, node: Node):
-        for existing_node in self.graph.nodes:
-            if existing_node.x == node.x and existing_node.y == node.y:
-                return existing_node
+    # Отмечает изменение узла, сегмента, опоры или шарнира. Изменение нагрузок (topology=False)
+    # пересчитывает только правую часть системы, остальное — требует полной пересборки
+    def mark_dirty(self, obj, topology: bool = False):
+        self.dirty.add(obj)
+        if topology:
+            self.topology_version += 1
+
+    # Сбрасывает кэш сборки (например, после прямого изменения атрибутов опор и нагрузок)
+    def invalidate(self):
+        self.topology_version += 1
 
-        self.graph.add_node(node)
+    # Узел перемещён (Node.move_to): меняются плечи моментов, поэтому система собирается заново
+    def node_moved(self, node: Node):
+        self._node_index.insert(node, node.x, node.y)
+        self.topology.move_node(node)
+        self.mark_dirty(node, topology=True)
+
+    # Существующий узел в пределах tolerance от точки (x, y) или None
+    def find_node(self, x: float, y: float) -> Node | None:
+        return self._node_index.nearest(x, y, self.tolerance)
+
+    def add_node(self, node: Node):
+        existing_node = self.find_node(node.x, node.y)
+        if existing_node is not None:
+            return existing_node
+
+        self.topology.add_node(node)
+        self.node_numbering.add(node)
+        self._node_index.insert(node, node.x, node.y)
+        if node.owner is None:
+            node.owner = self
+        self.mark_dirty(node, topology=True)
         return node
 
+    def remove_node(self, node: Node):
+        # Вместе с узлом удаляются и примыкающие сегменты
+        for segment in self.topology.remove_node(node):
+            self.segment_numbering.remove(segment)
+            if segment.owner is self:
+                segment.owner = None
+        self.node_numbering.remove(node)
+        self._node_index.remove(node)
+        if node.owner is self:
+            node.owner = None
+        self.mark_dirty(node, topology=True)
+
+    def clear(self):
+        for node in self.get_nodes():
+            if node.owner is self:
+                node.owner = None
+        for segment in self.get_segments():
+            if segment.owner is self:
+                segment.owner = None
+        self.topology.clear()
+        self.node_numbering.clear()
+        self.segment_numbering.clear()
+        self._node_index.clear()
+        self.ids.reset()
+        self.dirty.clear()
+        self.invalidate()
+
     def add_segment(self, segment: BeamSegment) -> BeamSegment:
         node1 = self.add_node(segment.node1)
         node2 = self.add_node(segment.node2)
 
-        if node1.x == node2.x and node1.y == node2.y:
+        if node1 is node2:
             raise DotBeamError("Балка не может начинаться и заканчиваться в одной точке!")
 
-        if self.graph.has_edge(node1, node2):
-            return self.graph[node1][node2]['object']
-
-        self.graph.add_edge(node1, node2, object=segment)
+        existing_segment = self.topology.find_segment(node1, node2)
+        if existing_segment is not None:
+            return existing_segment
+
+        # Концы сегмента указывают на узлы балки, с которыми они слились
+        segment.node1, segment.node2 = node1, node2
+        self.topology.add_segment(node1, node2, segment)
+        self.segment_numbering.add(segment)
+        if segment.owner is None:
+            segment.owner = self
+        self.mark_dirty(segment, topology=True)
         return segment
 
+    # Добавляет сразу много новых узлов и сегментов (ends — пары индексов концов в nodes).
+    # Узлы не сливаются с существующими и между собой, поэтому вызывающий отвечает за то,
+    # что среди них нет совпадающих узлов и повторных сегментов (см. from_arrays)
+    def extend(self, nodes: list[Node], ends: np.ndarray, segments: list[BeamSegment]):
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1, 2)
+        self.topology.extend(nodes, ends, segments)
+        self.node_numbering.extend(nodes)
+        self.segment_numbering.extend(segments)
+        self._node_index.insert_many(nodes, [node.x for node in nodes], [node.y for node in nodes])
+        for node in nodes:
+            if node.owner is None:
+                node.owner = self
+        for segment in segments:
+            if segment.owner is None:
+                segment.owner = self
+        self.invalidate()
+
+    # Балка целиком из массивов (например, из параметрического генератора):
+    #   coords   — (n, 2) координаты узлов;
+    #   segments — (m, 2) индексы концов сегментов в coords;
+    #   supports — (s, 3) строки (узел, тип Support.Type, угол); неизвестные реакции —
+    #              как у опор, добавленных в интерфейсе;
+    #   hinges   — (h,) индексы узлов с шарнирами;
+    #   forces   — (f, 5) строки (сегмент, значение, угол, отступ от node1, длина действия);
+    #   torques  — (t, 3) строки (сегмент, значение, отступ от node1).
+    # Все проверки выполняются одним векторным проходом до создания объектов, поэтому при
+    # ошибке ничего не создаётся. Как в add_node и add_segment, узел не дальше tolerance
+    # от уже добавленного сливается с ним (см. merge_points), а повторный сегмент совпадает с первым
+    @classmethod
+    def from_arrays(cls, coords, segments, supports=None, hinges=None, forces=None, torques=None,
+                    tolerance: float = 1e-9, compact: bool = False) -> "Beam":
+        def table(array, width, dtype=float):
+            array = np.empty((0, width), dtype=dtype) if array is None else np.asarray(array, dtype=dtype)
+            if array.size == 0:
+                array = array.reshape(0, width)
+            if array.ndim != 2 or array.shape[1] != width:
+                raise ValueError(f"Ожидается массив формы (k, {width}), получен {array.shape}")
+            return array
+
+        coords = table(coords, 2)
+        pairs = table(segments, 2, np.int64)
+        supports = table(supports, 3)
+        forces = table(forces, 5)
+        torques = table(torques, 3)
+        hinges = np.empty(0, dtype=np.int64) if hinges is None else np.asarray(hinges, dtype=np.int64).reshape(-1)
+
+        if not np.all(np.isfinite(coords)) or not np.all(np.isfinite(supports)) \
+                or not np.all(np.isfinite(forces)) or not np.all(np.isfinite(torques)):
+            raise NotANumberError("Координаты и нагрузки должны быть числами!")
+        for indices, count in ((pairs, len(coords)), (supports[:, 0], len(coords)), (hinges, len(coords))):
+            bad = (indices < 0) | (indices >= count) | (indices != np.trunc(indices))
+            if np.any(bad):
+                raise NonExistentError(f"Узел {indices[bad].flat[0]:g} не существует!")
+        if np.any(~np.isin(supports[:, 1], [t.value for t in Support.Type])):
+            raise IncorrectInputError("Неизвестный тип опоры!")
+
+        kept, node_of = merge_points(coords, tolerance)  # node_of: исходный индекс узла -> индекс слитого
+
+        pairs = node_of[pairs]
+        if np.any(pairs[:, 0] == pairs[:, 1]):
+            raise DotBeamError("Балка не может начинаться и заканчиваться в одной точке!")
+        _, first, inverse = np.unique(np.sort(pairs, axis=1), axis=0, return_index=True, return_inverse=True)
+        kept_segments = np.sort(first)
+        rank = np.empty(len(pairs), dtype=np.int64)
+        rank[kept_segments] = np.arange(len(kept_segments))
+        segment_of = rank[first[inverse.reshape(-1)]]
+
+        points = coords[kept]
+        ends = pairs[kept_segments]
+        lengths = np.hypot(*(points[ends[:, 0]] - points[ends[:, 1]]).T)
+        for loads, name in ((forces, "сил"), (torques, "моментов")):
+            bad = (loads[:, 0] < 0) | (loads[:, 0] >= len(pairs)) | (loads[:, 0] != np.trunc(loads[:, 0]))
+            if np.any(bad):
+                raise NonExistentError(f"Сегмент балки {loads[bad, 0][0]:g} не существует!")
+        force_segments = segment_of[forces[:, 0].astype(np.int64)]
+        torque_segments = segment_of[torques[:, 0].astype(np.int64)]
+        if np.any(forces[:, 1] < 0):
+            raise NegativeOrZeroValueError("Значение силы не может быть отрицательным!")
+        if np.any(forces[:, 3] < 0) or np.any(torques[:, 2] < 0):
+            raise NegativeOrZeroValueError("Расстояние от края не может быть отрицательным!")
+        if np.any(forces[:, 4] <= 0):
+            raise NegativeOrZeroValueError("Длина действия силы должна быть положительной!")
+        if np.any(forces[:, 3] > lengths[force_segments]) or np.any(torques[:, 2] > lengths[torque_segments]):
+            raise HighDistanceError("Отступ не может быть больше длины сегмента!")
+
+        beam = cls(tolerance=tolerance, compact=compact)
+        with beam.ids.activate():
+            nodes = [Node(x, y) for x, y in points.tolist()]
+            for index, support_type, angle in supports.tolist():
+                support_type = Support.Type(int(support_type))
+                nodes[node_of[int(index)]].add_support(Support(
+                    support_type, angle, 0, 0, 0,
+                    support_type != Support.Type.ROLLER, True, support_type == Support.Type.FIXED))
+            for index in node_of[hinges].tolist():
+                if nodes[index].hinge is None:
+                    nodes[index].add_hinge()
+
+            beam_segments = [BeamSegment(nodes[i], nodes[j]) for i, j in ends.tolist()]
+            # Нагрузки уже проверены, поэтому добавляются в списки напрямую
+            for index, (_, value, angle, node1_dist, length) in zip(force_segments.tolist(), forces.tolist()):
+                beam_segments[index].forces.append(Force(value, angle, node1_dist, length))
+            for index, (_, value, node1_dist) in zip(torque_segments.tolist(), torques.tolist()):
+                beam_segments[index].torques.append(Torque(value, node1_dist))
+
+        beam.extend(nodes, ends, beam_segments)
+        return beam
+
+    # Сегменты и узлы в порядке их номеров
     def get_segments(self):
-        return [data['object'] for _, _, data in self.graph.edges(data=True)]
+        return self.segment_numbering.objects()
 
     def get_nodes(self):
-        return list(self.graph.nodes)
+        return self.node_numbering.objects()
+
+    # Граф networkx с узлами Node и рёбрами {'object': сегмент}; для компактного
+    # хранилища это представление, которое строится лениво
+    @property
+    def graph(self) -> nx.Graph:
+        return self.topology.graph
 
+    # Перенумеровывает элементы балки по порядку в её собственном реестре ids.
+    # Глобальное состояние не затрагивается, поэтому другие модели нумерацию не теряют.
+    # Шарниры сохраняют свои номера, если они не заняты
     def reassign_ids(self):
-        for cls in [Node, BeamSegment, Force, Torque, Support]:
-            cls._next_id = 1
-            cls._used_ids.clear()
+        self.ids.reset()
 
+        hinges = []
         for idx, node in enumerate(self.get_nodes(), start=1):
-            node.id = idx
+            node.bind_id(self.ids, idx)
             if node.support:
-                node.support.id = Support._next_id
-                Support._used_ids.add(Support._next_id)
-                Support._next_id += 1
+                node.support.bind_id(self.ids)
+                node.support.force.bind_id(self.ids)
+                node.support.torque.bind_id(self.ids)
+            if node.hinge and node.hinge not in hinges:
+                hinges.append(node.hinge)
 
-                node.support.force.id = Force._next_id
-                Force._used_ids.add(Force._next_id)
-                Force._next_id += 1
-
-                node.support.torque.id = Torque._next_id
-                Torque._used_ids.add(Torque._next_id)
-                Torque._next_id += 1
+        for hinge in hinges:
+            hinge.bind_id(self.ids, None if self.ids.is_used(Hinge, hinge.id) else hinge.id)
 
         for idx, segment in enumerate(self.get_segments(), start=1):
-            segment.id = idx
+            segment.bind_id(self.ids, idx)
             for force in segment.forces:
-                force.id = Force._next_id
-                Force._used_ids.add(Force._next_id)
-                Force._next_id += 1
+                force.bind_id(self.ids)
             for torque in segment.torques:
-                torque.id = Torque._next_id
-                Torque._used_ids.add(Torque._next_id)
-                Torque._next_id += 1
+                torque.bind_id(self.ids)
 
     @staticmethod
     def format_readable_answers(answer_dict: dict[str, float]) -> dict[str, float]:
@@ -317,7 +814,7 @@ class Beam(IDNumerator):
             elif key.startswith('hinge_') and '_for_beam_' in key:
                 parts = key.split('_')
                 hinge_id = parts[1]
-                beam_id = int(parts[4]) - 1
+                beam_id = parts[4]
                 direction = 'горизонтальная' if '_force_x' in key else 'вертикальная'
                 readable_answer[f"{direction.capitalize()} реакция в шарнире {hinge_id} для балки {beam_id}"] = value
 
@@ -326,151 +823,133 @@ class Beam(IDNumerator):
 
         return readable_answer
 
-    def build_equations(self):
-        fx_dict, fy_dict, t_dict = {}, {}, {}
-
-        def add_force_parts(name: str, force: Force, x: float, y: float):
-            part = force.part_x
-            fx_dict[f'{name}_x'] = '?' if force.unknown_x else part
-            t_dict[f'{name}_x_torque'] = 0 if y == 0 else f'{-y}*{name}_x' if force.unknown_x else part * -y
-
-            part = force.part_y
-            fy_dict[f'{name}_y'] = '?' if force.unknown_y else part
-            t_dict[f'{name}_y_torque'] = 0 if x == 0 else f'{x}*{name}_y' if force.unknown_y else part * x
-
-        hinges_equations = []
-
-        for node in self.get_nodes():
-            if node.support:
-                nid = f'node_{node.id}'
-                add_force_parts(f'{nid}', node.support.force, node.x, node.y)
-                t_dict[f'{nid}_torque'] = '?' if node.support.torque.unknown else node.support.torque.value
-
-            elif node.hinge:
-                hinge = node.hinge
-                if self not in hinge.bodies:
-                    continue
-
-                prefix = f'hinge_{hinge.id}_for_beam_{self.id}'
-                name_x = f'{prefix}_force_x'
-                name_y = f'{prefix}_force_y'
-
-                fx_dict[name_x] = '?'
-                fy_dict[name_y] = '?'
-
-                t_dict[f'{name_x}_torque'] = f'{-node.y}*{name_x}' if node.y != 0 else 0
-                t_dict[f'{name_y}_torque'] = f'{node.x}*{name_y}' if node.x != 0 else 0
-
-                if hinge.bodies[0] == self:
-                    hinges_equations.extend([
-                        sp.Eq(sp.simplify(
-                            ' + '.join(f'hinge_{hinge.id}_for_beam_{body.id}_force_x' for body in hinge.bodies)
-                        ), 0),
-
-                        sp.Eq(sp.simplify(
-                            ' + '.join(f'hinge_{hinge.id}_for_beam_{body.id}_force_y' for body in hinge.bodies)
-                        ), 0),
-
-                        # sp.Eq(sp.simplify(
-                        #     ' + '.join(
-                        #         f'hinge_{hinge.id}_for_beam_{body.id}_force_x_torque + hinge_{hinge.id}_for_beam_{body.id}_force_y_torque'
-                        #         for body in hinge.bodies)
-                        # ), 0),
-                    ])
-
-
-        for segment in self.get_segments():
-            sid = f'segment_{segment.id}'
-            for force in segment.forces:
-                x = segment.node1.x + force.node1_dist * (segment.node2.x - segment.node1.x) / segment.length
-                y = segment.node1.y + force.node1_dist * (segment.node2.y - segment.node1.y) / segment.length
-                add_force_parts(f'{sid}_force_{force.id}', force, x, y)
-            for torque in segment.torques:
-                t_dict[f'{sid}_torque_{torque.id}'] = '?' if torque.unknown else torque.value
-
-        eqs = [
-            sp.Eq(sp.simplify(' + '.join(fx_dict.keys())), 0),
-            sp.Eq(sp.simplify(' + '.join(fy_dict.keys())), 0),
-            sp.Eq(sp.simplify(' + '.join(t_dict.keys())), 0)
-        ]
-
-        eqs.extend(hinges_equations)
-
-        secondary_eqs = []
-        unknowns = []
-        all_symbols = []
-
-        for d in (fx_dict, fy_dict, t_dict):
-            for key, val in d.items():
-                if val == '?':
-                    unknowns.append(key)
-                else:
-                    secondary_eqs.append(sp.Eq(sp.Symbol(key), sp.simplify(val)))
-                all_symbols.append(key)
-
-        return eqs, secondary_eqs, unknowns, all_symbols
-
-    def solve(self):
-        if len(self.graph.nodes) == 0:
+    # Добавляет в систему уравнения равновесия всех тел, на которые балку делят шарниры
+    def build_equations(self, system: LinearSystem):
+        subbeams, _, hinge_bodies = self.decompose()
+        segment_rows = []
+        for body in subbeams:
+            body.build_equations(system, hinge_bodies, segment_rows)
+        add_segments_to_system(system, segment_rows)
+
+    # Способы решения: 'numeric' — разреженная линейная система (быстро),
+    # 'symbolic' — прежнее точное решение через sympy (для проверки результатов)
+    SOLVE_METHODS = ('numeric', 'symbolic')
+
+    # Проверяет модель и собирает общую систему уравнений по всем телам,
+    # на которые балку делят шарниры
+    def build_system(self) -> tuple[list[SubBeam], LinearSystem]:
+        if self.topology.number_of_nodes() == 0:
             raise NoBeamError("Нет балки!")
         
         if all(node.support is None for node in self.get_nodes()):
             raise NoSupportsError("Вы не добавили опор!")
 
-        if not nx.is_connected(self.graph):
+        if not self.topology.is_connected():
             raise DividedBeamError("Балка состоит из несвязанных сегментов!")
 
         self.reassign_ids()
 
         subbeams = self.split_beam_by_hinges()
 
-        for b in subbeams:
-            print(b.pretty_print())
-        print()
-
-        eqs = []
-        secondary_eqs = []
-        unknowns_set = set()
-        all_symbols_set = set()
+        system = LinearSystem()
+        self.build_equations(system)
 
-        for beam in subbeams:
-            e, s, u, a = beam.build_equations()
-            eqs.extend(e)
-            secondary_eqs.extend(s)
-            unknowns_set.update(u)
-            all_symbols_set.update(a)
-
-        unknowns = list(unknowns_set)
-        all_symbols = list(all_symbols_set)
-
-        if len(unknowns) > len(eqs):
+        if len(system.unknowns) > len(system.rows):
             raise TooManyUnknownsError("Слишком много неизвестных!")
 
-        # print('---eqs---')
-        # for i in eqs:
-        #     print(i)
-
-        # print('---secondary_eqs---')
-        # for i in secondary_eqs:
-        #     print(i)
-
-        # print('---unknowns---')
-        # print(unknowns)
-
-        # print('---all_symbols---')
-        # print(all_symbols)
+        return subbeams, system
+
+    # Система уравнений с кэшем: пока топология не менялась, переиспользуются подбалки,
+    # левая часть и её разложение, а для изменённых сегментов пересчитываются только нагрузки
+    def assemble(self) -> tuple[list[SubBeam], LinearSystem]:
+        if self._assembly is not None and self._assembly_version == self.topology_version:
+            subbeams, system = self._assembly
+            changed = [obj for obj in self.dirty if isinstance(obj, BeamSegment) and obj in system.groups]
+            system.clear_loads(*changed)
+            add_segments_to_system(system, [(system.groups[segment], segment) for segment in changed],
+                                   with_unknowns=False)
+        else:
+            version = self.topology_version
+            subbeams, system = self.build_system()
+            self._assembly = subbeams, system
+            self._assembly_version = version
+            self._factorization = None
+
+        self.dirty.clear()
+        return subbeams, system
+
+    # Разложение левой части текущей сборки (выполняется один раз на версию топологии)
+    def factorization(self):
+        if self._factorization is None:
+            _, system = self.assemble()
+            self._factorization = factorize(system.matrix())
+        return self._factorization
+
+    # Значения всех неизвестных системы (без округления и без печати)
+    def solution(self, method: str = 'numeric') -> dict[str, float]:
+        if method not in Beam.SOLVE_METHODS:
+            raise ValueError(f"Неизвестный способ решения: {method}")
+
+        _, system = self.assemble()
+        if method == 'symbolic':
+            return solve_symbolic(system)
+        return solve_numeric(system, self.factorization())
+
+    def solve(self, method: str = 'numeric'):
+        if method not in Beam.SOLVE_METHODS:
+            raise ValueError(f"Неизвестный способ решения: {method}")
+
+        subbeams, _ = self.assemble()
 
-        # print()
-        solution = sp.solve(eqs + secondary_eqs, sp.symbols(all_symbols))
+        for b in subbeams:
+            print(b.pretty_print())
+        print()
 
-        if len(solution) < 1:
-            raise UnsolvableError("Невозможно найти решение либо система подвижна!")
+        return Beam.readable_answers(self.solution(method))
 
-        try:
-            raw_answer = {str(k): round(float(v), 2) for k, v in solution.items() if str(k) in unknowns}
-            return Beam.format_readable_answers(raw_answer)
-        except Exception as e:
-            raise UnsolvableError("Невозможно найти решение либо система подвижна!")
+    # Ответы в том виде, в каком их показывает окно результатов (+ 0.0 убирает «-0.0» после округления)
+    @staticmethod
+    def readable_answers(solution: dict[str, float]) -> dict[str, float]:
+        raw_answer = {k: round(solution[k], 2) + 0.0 for k in sorted(solution)}
+        return Beam.format_readable_answers(raw_answer)
+
+    # Реакции опор в глобальных осях: номер узла -> (Rx, Ry, M).
+    # Известные составляющие опор — нагрузки, а не реакции, поэтому они равны нулю
+    def reactions(self, method: str = 'numeric') -> dict[int, tuple[float, float, float]]:
+        return self.support_reactions(self.solution(method))
+
+    def support_reactions(self, solution: dict[str, float]) -> dict[int, tuple[float, float, float]]:
+        result = {}
+        for number, node in self.node_numbering.items():
+            if node.support is not None:
+                nid = f'node_{node.id}'
+                result[number] = (solution.get(f'{nid}_x', 0.0), solution.get(f'{nid}_y', 0.0),
+                                  solution.get(f'{nid}_torque', 0.0))
+        return result
+
+    # Решатель для серии загружений: левая часть собирается и раскладывается один раз
+    def load_case_solver(self) -> LoadCaseSolver:
+        _, system = self.assemble()
+        return LoadCaseSolver(system, self.factorization())
+
+    # Решает систему для каждого загружения ({сила или момент: значение}; не указанные
+    # нагрузки сохраняют текущие значения). Строки результата — загружения,
+    # столбцы — неизвестные реакции в порядке LoadCaseSolver.unknowns
+    def solve_load_cases(self, load_cases: list[dict]) -> np.ndarray:
+        return self.load_case_solver().solve(load_cases)
+
+    # Расчёт для другого потока (см. SolveJob). Сборка выполняется здесь, в потоке, который
+    # владеет балкой, и после правки нагрузок она инкрементальная; готовое разложение
+    # из кэша передаётся заданию, так что в потоке остаётся лишь обратная подстановка
+    def solve_job(self) -> SolveJob:
+        _, system = self.assemble()
+        return SolveJob(system, self._factorization)
+
+    # Вызывается в потоке балки после SolveJob.compute: разложение, построенное заданием,
+    # попадает в кэш, если с тех пор система не пересобиралась
+    def finish_job(self, job: SolveJob):
+        if self._assembly is not None and self._assembly[1] is job.system and self._factorization is None:
+            self._factorization = job.factor
 
     def __repr__(self):
         return f"Beam(segments={self.get_segments()})"
@@ -486,41 +965,67 @@ class Beam(IDNumerator):
             lines.append(segment.pretty_print(indent + 2))
         return '\n'.join(lines)
     
-    def split_beam_by_hinges(self) -> list["Beam"]:
-        hinge_nodes = [n for n in self.graph.nodes if n.hinge is not None]
-        g_wo_hinges = self.graph.copy()
-        g_wo_hinges.remove_nodes_from(hinge_nodes)
-        components = list(nx.connected_components(g_wo_hinges))
-
-        subbeams = []
-        node_to_subbeam = {}
-
-        for nodes in components:
-            extended_nodes = set(nodes)
-
-            for node in nodes:
-                for neighbor in self.graph.neighbors(node):
+    # Разбиение балки шарнирами на тела. Считается один раз на версию топологии:
+    # возвращает тела, словарь {узел: тела, в которые он входит} и {шарнир: тела, которые он соединяет}
+    def decompose(self) -> tuple[list[SubBeam], dict[Node, list[SubBeam]], dict[Hinge, list[SubBeam]]]:
+        if self._decomposition is not None and self._decomposition_version == self.topology_version:
+            return self._decomposition
+
+        nodes = self.get_nodes()
+        node_bodies: dict[Node, list[SubBeam]] = {}
+        segment_body: dict[BeamSegment, SubBeam] = {}
+        subbeams: list[SubBeam] = []
+
+        def attach(body: SubBeam, node: Node):
+            bodies = node_bodies.setdefault(node, [])
+            if body not in bodies:
+                bodies.append(body)
+                body.nodes.append(node)
+
+        # Связные части графа без шарнирных узлов (обход в ширину)
+        for start in nodes:
+            if start.hinge is not None or start in node_bodies:
+                continue
+            body = SubBeam(len(subbeams) + 1)
+            subbeams.append(body)
+            attach(body, start)
+            queue = [start]
+            while queue:
+                node = queue.pop()
+                for neighbor, segment in self.topology.incident(node):
+                    if segment not in segment_body:
+                        segment_body[segment] = body
+                        body.segments.append(segment)
                     if neighbor.hinge is not None:
-                        extended_nodes.add(neighbor)
-
-            subgraph = self.graph.subgraph(extended_nodes)
-            beam = Beam()
-            for u, v, data in subgraph.edges(data=True):
-                beam.add_segment(data['object'])
-
-            for node in subgraph.nodes:
-                node_to_subbeam[node] = beam
+                        attach(body, neighbor)
+                    elif neighbor not in node_bodies:
+                        attach(body, neighbor)
+                        queue.append(neighbor)
 
-            subbeams.append(beam)
-
-        for hinge_node in hinge_nodes:
-            hinge = hinge_node.hinge
-            if not hinge:
+        # Сегмент между двумя шарнирами — отдельное тело
+        for segment in self.get_segments():
+            if segment not in segment_body:
+                body = SubBeam(len(subbeams) + 1)
+                subbeams.append(body)
+                segment_body[segment] = body
+                body.segments.append(segment)
+                attach(body, segment.node1)
+                attach(body, segment.node2)
+
+        hinge_bodies: dict[Hinge, list[SubBeam]] = {}
+        for node in nodes:
+            if node.hinge is None:
                 continue
-
-            for neighbor in self.graph.neighbors(hinge_node):
-                beam = node_to_subbeam.get(neighbor)
-                if beam:
-                    hinge.assign_body(beam)
-
-        return subbeams
\ No newline at end of file
+            bodies = hinge_bodies.setdefault(node.hinge, [])
+            for _, segment in self.topology.incident(node):
+                body = segment_body[segment]
+                if body not in bodies:
+                    bodies.append(body)
+            node.hinge.bodies = list(bodies)
+
+        self._decomposition = subbeams, node_bodies, hinge_bodies
+        self._decomposition_version = self.topology_version
+        return self._decomposition
+
+    def split_beam_by_hinges(self) -> list[SubBeam]:
+        return self.decompose()[0]
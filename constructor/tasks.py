@@ -0,0 +1,54 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+# Сигналы задачи расчёта: QRunnable не наследует QObject и сам объявить их не может
+class SolveSignals(QObject):
+    finished = pyqtSignal(object)  # Результат compute (значения неизвестных системы)
+    failed = pyqtSignal(object)  # Исключение, прервавшее расчёт
+    done = pyqtSignal()  # Задача завершилась (в том числе отменённая)
+
+
+# Расчёт балки в потоке QThreadPool, чтобы окно не замирало на больших рамах.
+# Задача создаётся в потоке окна: Beam.solve_job собирает систему (после правки нагрузок —
+# инкрементально) и берёт разложение из кэша балки. В пуле выполняется только SolveJob.compute,
+# который модель не читает, поэтому балку можно редактировать во время расчёта. После ответа
+# в потоке окна нужно вызвать finish(), чтобы новое разложение попало в кэш балки.
+# splu прервать нельзя, поэтому отмена только помечает задачу: её результат отбрасывается,
+# а поток дорабатывает и возвращается в пул. Сигналы доставляются в поток, где к ним подключились
+class SolveTask(QRunnable):
+    # Запущенные задачи: ссылка держит объект сигналов живым, даже когда
+    # отменённую задачу уже никто не ждёт (снимается по сигналу done)
+    active: set = set()
+
+    def __init__(self, beam):
+        super().__init__()
+        self.beam = beam
+        self.job = beam.solve_job()
+        self.cancelled = False
+        self.signals = SolveSignals()
+        self.signals.done.connect(lambda: SolveTask.active.discard(self))
+
+    def start(self, pool: QThreadPool | None = None):
+        SolveTask.active.add(self)
+        (pool or QThreadPool.globalInstance()).start(self)
+
+    def cancel(self):
+        self.cancelled = True
+
+    # Сохраняет в балке результаты задачи, которые пригодятся следующему расчёту (в потоке окна)
+    def finish(self):
+        self.beam.finish_job(self.job)
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            solution = self.job.compute()
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(e)
+        else:
+            if not self.cancelled:
+                self.signals.finished.emit(solution)
+        finally:
+            self.signals.done.emit()
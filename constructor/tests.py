@@ -3,12 +3,14 @@ from PyQt6.QtWidgets import QLineEdit, QComboBox, QCheckBox
 # from main import (
 #     BaseDialog, BeamSegmentDialog, SupportDialog, ForceDialog, TorqueDialog, SolveDialog, DialogManager
 # )
-from structures import IncorrectInputError, NonExistentError, Node, BeamSegment, Support, Force, Torque
+from solver import LinearSystem
+from structures import IncorrectInputError, NonExistentError, UnsolvableError, DotBeamError, Beam, Node, BeamSegment, Support, Force, Torque
+from errors import HighDistanceError, NegativeOrZeroValueError, NotANumberError
 
 import pytest
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtTest import QTest
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QPointF
 
 import pytest
 from PyQt6.QtWidgets import QLineEdit, QComboBox, QCheckBox
@@ -185,9 +187,20 @@ class DummyBeam2:
         if not isinstance(segment, BeamSegment):
             raise IncorrectInputError("Bad segment")
         self.added_segments.append(segment)
-    def solve(self):
+    def solve(self, method='numeric'):
         self.solve_called = True
         return {'Rx': 42, 'Ry': 84}
+    def solve_job(self):
+        return DummyJob(self.solve)
+    def finish_job(self, job):
+        self.finished_job = job
+    def readable_answers(self, solution):
+        return solution
+
+# Задание расчёта (как solver.SolveJob): compute выполняется в потоке пула
+class DummyJob:
+    def __init__(self, compute):
+        self.compute = compute
 
 class DummyNode2:
     def __init__(self):
@@ -229,11 +242,16 @@ def test_dialog_manager_handle_non_existent_error(monkeypatch):
     manager.open_support_dialog()
     assert not grid.updated
 
-def test_dialog_manager_solve(monkeypatch):
+def test_dialog_manager_solve(monkeypatch, qtbot):
+    shown = []
+    monkeypatch.setattr("dialogs.SolveDialog.exec", lambda self: shown.append(self))
     grid = DummyGrid2()
     manager = DialogManager(grid)
     manager.open_solve_dialog()
+    qtbot.waitUntil(lambda: len(shown) == 1)
     assert grid.beam.solve_called
+    assert manager.solve_task is None
+    assert isinstance(grid.beam.finished_job, DummyJob)  # Результат задания возвращён балке
 
 
 # === smart_str ===
@@ -354,9 +372,18 @@ class DummyBeam:
     def add_segment(self, segment):
         self.segment_added = segment
 
-    def solve(self):
+    def solve(self, method='numeric'):
         return {'Rx': 1.0, 'Ry': 2.0}
 
+    def solve_job(self):
+        return DummyJob(self.solve)
+
+    def finish_job(self, job):
+        pass
+
+    def readable_answers(self, solution):
+        return solution
+
 class DummyNode:
     def add_support(self, support):
         self.support_added = support
@@ -368,11 +395,14 @@ class DummySegment:
     def add_torque(self, torque):
         self.torque_added = torque
 
-def test_dialog_manager_solve_dialog(qtbot):
+def test_dialog_manager_solve_dialog(monkeypatch, qtbot):
+    shown = []
+    monkeypatch.setattr("dialogs.SolveDialog.exec", lambda self: shown.append(self))
     grid = DummyGrid()
     manager = DialogManager(grid)
     # Просто проверим, что вызов не вызывает исключения
     manager.open_solve_dialog()
+    qtbot.waitUntil(lambda: len(shown) == 1)
 
 # Если приложение не создано — создаём его (для тестов GUI нужно приложение)
 app = QApplication.instance() or QApplication([])
@@ -618,3 +648,1011 @@ def test_dialog_manager_open_support_dialog_invalid_node(monkeypatch, qtbot):
 
     manager.open_support_dialog()  # Ожидается, что NonExistentError отработает и не будет update
     assert not hasattr(grid, "updated")
+
+
+# === Beam.solve: численный и символьный способы ===
+
+def make_simple_beam():
+    beam = Beam()
+    nodes = [beam.add_node(Node(0, 0)), beam.add_node(Node(4, 0))]
+    nodes[0].add_support(Support(Support.Type.PINNED, 0, 0, 0, 0, True, True, False))
+    nodes[1].add_support(Support(Support.Type.ROLLER, 0, 0, 0, 0, False, True, False))
+    segment = beam.add_segment(BeamSegment(nodes[0], nodes[1]))
+    segment.add_force(Force(10, 270, 1, 1, False))
+    return beam, segment
+
+
+def test_beam_solve_numeric_matches_symbolic():
+    beam, _ = make_simple_beam()
+    numeric = beam.solve()
+    symbolic = beam.solve(method='symbolic')
+    assert numeric == symbolic
+    assert numeric['Вертикальная реакция в узле 1'] == 7.5
+    assert numeric['Вертикальная реакция в узле 2'] == 2.5
+
+
+# Округление до нуля не должно давать «-0.0» в окне результатов
+def test_beam_readable_answers_no_negative_zero():
+    import math
+    answers = Beam.readable_answers({'node_1_x': -1e-12, 'node_1_y': -0.0, 'node_2_y': -2.504})
+    assert answers == {
+        'Горизонтальная реакция в узле 1': 0.0,
+        'Вертикальная реакция в узле 1': 0.0,
+        'Вертикальная реакция в узле 2': -2.5,
+    }
+    assert math.copysign(1, answers['Горизонтальная реакция в узле 1']) == 1
+    assert math.copysign(1, answers['Вертикальная реакция в узле 1']) == 1
+
+
+# Без горизонтальных сил и реакций уравнение равновесия по X пустое — symbolic не должен на нём падать
+def test_beam_solve_symbolic_two_rollers():
+    beam = Beam()
+    nodes = [beam.add_node(Node(0, 0)), beam.add_node(Node(4, 0))]
+    for node in nodes:
+        node.add_support(Support(Support.Type.ROLLER, 0, 0, 0, 0, False, True, False))
+    segment = beam.add_segment(BeamSegment(*nodes))
+    segment.add_force(Force(10, 270, 1, 1, False))
+    numeric = beam.solve()
+    assert numeric == beam.solve(method='symbolic')
+    assert numeric['Вертикальная реакция в узле 1'] == 7.5
+    assert numeric['Вертикальная реакция в узле 2'] == 2.5
+
+
+def test_beam_solve_numeric_movable_system():
+    beam, segment = make_simple_beam()
+    segment.forces.clear()
+    segment.add_force(Force(10, 30, 1, 1, False))
+    beam.get_nodes()[0].support.force.unknown_x = False
+    with pytest.raises(UnsolvableError):
+        beam.solve()
+
+
+def test_beam_build_equations_rows():
+    beam, _ = make_simple_beam()
+    beam.reassign_ids()
+    system = LinearSystem()
+    beam.build_equations(system)
+    assert system.unknowns == ['node_1_x', 'node_1_y', 'node_2_y']
+    fx_row, fy_row, t_row = system.rows
+    assert fx_row == {0: 1.0}
+    assert fy_row == {1: 1.0, 2: 1.0}
+    assert t_row == {2: 4.0}
+    assert system.rhs_vector().tolist() == [0.0, 10.0, 10.0]
+
+
+def test_beam_solve_load_cases():
+    beam, segment = make_simple_beam()
+    force = segment.forces[0]
+    solver = beam.load_case_solver()
+    reactions = solver.solve([{}, {force: 20}, {force: 0}])
+    assert reactions.shape == (3, len(solver.unknowns))
+    column = solver.unknowns.index('node_2_y')
+    assert reactions[:, column] == pytest.approx([2.5, 5.0, 0.0])
+
+
+# === Beam: индекс узлов по координатам ===
+
+def test_beam_add_node_merges_close_nodes():
+    beam = Beam(tolerance=1e-6)
+    node = beam.add_node(Node(0.3, 1))
+    assert beam.add_node(Node(0.1 + 0.2, 1)) is node
+    assert beam.add_node(Node(0.3 + 1e-3, 1)) is not node
+    segment = beam.add_segment(BeamSegment(Node(0.3, 1 + 1e-7), Node(2, 1)))
+    assert segment.node1 is node
+    with pytest.raises(DotBeamError):
+        beam.add_segment(BeamSegment(Node(5, 5), Node(5, 5 + 1e-7)))
+
+
+def test_beam_remove_node_updates_index():
+    beam = Beam()
+    node = beam.add_node(Node(1, 1))
+    beam.remove_node(node)
+    assert beam.find_node(1, 1) is None
+    assert beam.add_node(Node(1, 1)) is not node
+
+
+# === Beam: повторный расчёт после изменения нагрузок ===
+
+def test_beam_resolve_after_load_edit():
+    beam, segment = make_simple_beam()
+    beam.solve()
+    version = beam.topology_version
+    segment.add_force(Force(4, 270, 3, 1, False))
+    segment.forces[0].value = 20
+    assert beam.topology_version == version
+    result = beam.solve()
+    assert result['Вертикальная реакция в узле 1'] == 16.0
+    assert result['Вертикальная реакция в узле 2'] == 8.0
+
+
+def test_beam_resolve_drops_replaced_loads():
+    beam, segment = make_simple_beam()
+    beam.solve()
+    count = len(beam.assemble()[1].loads)
+    removed = segment.forces[0]
+    for value in range(1, 6):
+        segment.clear_loads()
+        segment.add_force(Force(value, 270, 2, 1, False))
+        result = beam.solve()
+    assert result['Вертикальная реакция в узле 1'] == 2.5
+    _, system = beam.assemble()
+    assert len(system.loads) == count and removed not in system.load_index
+    assert all(system.load_index[load] == column for column, load in enumerate(system.loads))
+    with pytest.raises(NonExistentError):
+        beam.solve_load_cases([{removed: 1}])
+
+
+def test_beam_resolve_after_load_removal():
+    beam, segment = make_simple_beam()
+    extra_force, torque = Force(4, 270, 3, 1, False), Torque(8, 2)
+    segment.add_force(extra_force)
+    segment.add_torque(torque)
+    beam.solve()
+    version = beam.topology_version
+    segment.remove_torque(torque)
+    result = beam.solve()
+    assert result['Вертикальная реакция в узле 1'] == 8.5
+    assert result['Вертикальная реакция в узле 2'] == 5.5
+    segment.remove_force(extra_force)
+    assert beam.topology_version == version
+    assert beam.solve() == make_simple_beam()[0].solve()
+    segment.clear_loads()
+    assert beam.solve()['Вертикальная реакция в узле 1'] == 0.0
+
+
+def test_linear_system_clear_loads_reuses_columns():
+    system = LinearSystem()
+    rows = [system.add_row() for _ in range(3)]
+    loads = [Torque(value, 0) for value in (1, 2, 3)]
+    for row, load, owner in zip(rows, loads, 'abc'):
+        system.add_load(row, load, owner=owner)
+    system.clear_loads('a')
+    assert system.loads == [loads[2], loads[1]]
+    assert system.load_index == {loads[2]: 0, loads[1]: 1}
+    assert system.rhs_vector().tolist() == [0, -2, -3]
+
+
+def test_beam_resolve_after_topology_edit():
+    beam, _ = make_simple_beam()
+    beam.solve()
+    version = beam.topology_version
+    beam.get_nodes()[1].support = None
+    assert beam.topology_version > version
+    with pytest.raises(UnsolvableError):
+        beam.solve()
+
+
+# === Beam: разбиение шарнирами ===
+
+def make_hinged_beam(compact=False):
+    beam = Beam(compact=compact)
+    nodes = [beam.add_node(Node(x, 0)) for x in (0, 2, 4, 6)]
+    nodes[0].add_support(Support(Support.Type.PINNED, 0, 0, 0, 0, True, True, False))
+    nodes[1].add_support(Support(Support.Type.ROLLER, 0, 0, 0, 0, False, True, False))
+    nodes[2].add_hinge()
+    nodes[3].add_support(Support(Support.Type.ROLLER, 0, 0, 0, 0, False, True, False))
+    segments = [beam.add_segment(BeamSegment(nodes[i], nodes[i + 1])) for i in range(3)]
+    segments[2].add_force(Force(10, 270, 1, 1, False))
+    return beam, nodes
+
+
+def test_beam_decompose_is_cached():
+    beam, nodes = make_hinged_beam()
+    subbeams, node_bodies, hinge_bodies = beam.decompose()
+    assert len(subbeams) == 2
+    assert len(node_bodies[nodes[2]]) == 2
+    assert hinge_bodies[nodes[2].hinge] == subbeams
+    assert beam.decompose()[0] is subbeams
+
+
+def test_beam_resolve_hinged_beam_is_stable():
+    beam, _ = make_hinged_beam()
+    first = beam.solve()
+    beam.invalidate()
+    assert beam.solve() == first
+    assert first['Вертикальная реакция в узле 4'] == 5.0
+    assert any(key.endswith('для балки 2') for key in first)
+
+
+def test_beam_compact_topology_matches_graph():
+    beam, _ = make_hinged_beam()
+    compact, nodes = make_hinged_beam(compact=True)
+    assert sorted(compact.solve().values()) == sorted(beam.solve().values())
+    assert compact.topology.is_connected()
+    compact.remove_node(nodes[3])
+    assert len(compact.get_segments()) == 2
+    assert compact.graph.number_of_edges() == 2
+    assert not any(neighbor is nodes[3] for neighbor, _ in compact.topology.incident(nodes[2]))
+
+
+# === Компактные объекты модели ===
+
+@pytest.mark.parametrize("obj", [
+    Force(10, 270, 1, 1, False), Torque(5, 0), Node(0, 0), BeamSegment(Node(0, 0), Node(1, 0)),
+    Support(Support.Type.PINNED, 0, 0, 0, 0, True, True, False),
+])
+def test_model_objects_have_no_dict(obj):
+    assert not hasattr(obj, '__dict__')
+    with pytest.raises(AttributeError):
+        obj.unexpected = 1
+
+
+# === Реестры ID по моделям ===
+
+def test_beam_ids_are_scoped_per_model():
+    first, _ = make_simple_beam()
+    second, _ = make_simple_beam()
+    first.solve()
+    second.solve()
+    assert [node.id for node in first.get_nodes()] == [1, 2]
+    assert [node.id for node in second.get_nodes()] == [1, 2]
+    assert first.get_nodes()[0].registry is first.ids
+
+    with first.ids.activate():
+        node = Node(10, 0, custom_id=5)
+    assert node.registry is first.ids
+    with pytest.raises(ValueError):
+        with first.ids.activate():
+            Node(11, 0, custom_id=5)
+    Node(12, 0, custom_id=5)  # В реестре по умолчанию номер 5 свободен
+
+
+def test_beam_solve_concurrently():
+    from concurrent.futures import ThreadPoolExecutor
+    beams = [make_hinged_beam()[0] for _ in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda beam: sorted(beam.solve().values()), beams))
+    assert all(result == results[0] for result in results)
+
+
+# === Пакетный расчёт (batch.py) ===
+
+def test_batch_solves_directory_as_json_lines(tmp_path, capsys):
+    import json
+    from batch import main
+    from serialization import save_beam_to_file
+    beam, _ = make_simple_beam()
+    save_beam_to_file(beam, str(tmp_path / "simple.bm"))
+    (tmp_path / "broken.bm").write_text("{}", encoding="utf-8")
+
+    assert main([str(tmp_path), "--workers", "1"]) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    results = {line['file'].rsplit('/', 1)[-1].rsplit('\\', 1)[-1]: line for line in lines}
+    assert results['simple.bm']['status'] == 'ok'
+    assert results['simple.bm']['answers']['Вертикальная реакция в узле 1'] == 7.5
+    assert results['broken.bm']['error'] == 'KeyError'
+
+
+def test_batch_reports_solver_error_class(tmp_path):
+    from batch import solve_file
+    from serialization import save_beam_to_file
+    beam, segment = make_simple_beam()
+    segment.forces.clear()
+    segment.add_force(Force(10, 30, 1, 1, False))
+    beam.get_nodes()[0].support.force.unknown_x = False
+    save_beam_to_file(beam, str(tmp_path / "movable.bm"))
+    result = solve_file(str(tmp_path / "movable.bm"))
+    assert result['status'] == 'error'
+    assert result['error'] == 'UnsolvableError'
+
+
+# === GridWidget: кэш изображений ===
+
+def test_grid_pixmap_cache_is_reused(qtbot):
+    from grid import GridWidget
+    grid = GridWidget()
+    qtbot.addWidget(grid)
+    grid.resize(400, 300)
+    grid.beam, _ = make_hinged_beam()
+    grid.beam.get_segments()[0].add_torque(Torque(-5, 1))
+
+    grid.grab()
+    cached = dict(grid.pixmap_cache)
+    assert {key[0] for key in cached} >= {"arrow.svg", "circlearrow.svg", "hinge.svg", "support1.svg", "support2.svg"}
+    assert all(not pixmap.isNull() for pixmap in cached.values())
+
+    grid.grab()
+    assert grid.pixmap_cache.keys() == cached.keys()
+    assert all(grid.pixmap_cache[key] is pixmap for key, pixmap in cached.items())
+
+
+# === GridWidget: отсечение невидимых элементов ===
+
+def test_spatial_hash_box_query():
+    from spatial import SpatialHash
+    index = SpatialHash(1.0)
+    index.insert_box("short", 0, 0, 2, 0)
+    index.insert_box("long", 0, 5, 1000, 5)
+    index.insert("point", 10, 10)
+    assert set(index.query(1, -1, 3, 1)) == {"short"}
+    assert set(index.query(500, 4, 501, 6)) == {"long"}
+    assert set(index.query(-1, -1, 11, 11)) == {"short", "long", "point"}
+    index.remove("long")
+    assert set(index.query(500, 4, 501, 6)) == set()
+
+
+def test_grid_draws_only_visible_segments(qtbot):
+    from grid import GridWidget
+    grid = GridWidget()
+    qtbot.addWidget(grid)
+    grid.resize(400, 300)
+    nodes = [grid.beam.add_node(Node(x, 0)) for x in range(101)]
+    for i in range(100):
+        grid.beam.add_segment(BeamSegment(nodes[i], nodes[i + 1]))
+
+    grid.grab()
+    index = grid.scene_index()
+    visible = index.visible_segments(*grid.visible_area(grid.calculate_bounds(QPointF(200, 150))))
+    assert 0 < len(visible) < 20
+    assert [number for number, _ in visible] == list(range(1, len(visible) + 1))
+    assert len(grid.segment_mapping) == 100
+    assert len(grid.node_mapping) == 101
+    assert grid.scene_index() is index  # Без изменения топологии индекс не перестраивается
+
+    grid.beam.add_node(Node(0, 5))
+    assert grid.scene_index() is not index
+
+
+# === GridWidget: кэш фона ===
+
+def test_grid_background_tiles_reused_on_pan(qtbot, mocker):
+    from grid import GridWidget
+    grid = GridWidget()
+    qtbot.addWidget(grid)
+    grid.resize(600, 400)
+    grid.grab()
+    tiles = dict(grid.background_tiles)
+    assert tiles and len(grid.label_cache) > 0
+
+    render = mocker.spy(grid, "render_background_tile")
+    grid.offset += QPointF(grid.TILE_SIZE, 0)  # Сдвиг на целую плитку: нужна лишь одна новая колонка
+    grid.grab()
+    assert 0 < render.call_count <= len({j for _, j in tiles})
+    assert all(grid.background_tiles[key] is tile for key, tile in tiles.items() if key in grid.background_tiles)
+
+    grid.scale *= 2
+    grid.grab()
+    assert not any(grid.background_tiles.get(key) is tile for key, tile in tiles.items())
+
+
+# === GridWidget: пакетная отрисовка ===
+
+def test_points_to_polygon_copies_coordinates():
+    import numpy as np
+    from grid import points_to_polygon
+    polygon = points_to_polygon(np.array([[1.5, 2.0], [3.0, -4.25]]))
+    assert [(point.x(), point.y()) for point in (polygon.at(0), polygon.at(1))] == [(1.5, 2.0), (3.0, -4.25)]
+    assert points_to_polygon(np.empty((0, 2))).isEmpty()
+
+
+def test_grid_draws_segments_and_grid_in_batches(qtbot, mocker):
+    from PyQt6.QtGui import QPainter, QPixmap
+    from grid import GridWidget
+    grid = GridWidget()
+    qtbot.addWidget(grid)
+    grid.resize(400, 300)
+    nodes = [grid.beam.add_node(Node(x, 0)) for x in range(6)]
+    for i in range(5):
+        grid.beam.add_segment(BeamSegment(nodes[i], nodes[i + 1]))
+
+    pixmap = QPixmap(400, 300)
+    painter = QPainter(pixmap)
+    proxy = mocker.Mock(wraps=painter)
+    center = QPointF(200, 150)
+    grid.draw_grid(proxy, center, grid.calculate_bounds(center), *grid.calculate_spacing())
+    grid.draw_beams(proxy, center)
+    painter.end()
+
+    assert proxy.drawLine.call_count == 0
+    assert proxy.drawLines.call_count == 3  # Мелкая сетка, основная сетка, сегменты
+    assert proxy.drawRects.call_count == 1
+    assert proxy.drawText.call_count == 5
+
+
+# === GridWidget: уровень детализации ===
+
+def test_grid_switches_to_simplified_glyphs(qtbot, mocker):
+    from grid import GridWidget
+    grid = GridWidget()
+    qtbot.addWidget(grid)
+    grid.resize(400, 300)
+    beam, _ = make_hinged_beam()
+    grid.beam = beam
+
+    grid.grab()
+    assert not grid.simplified
+
+    grid.scale = 3  # Значки меньше LOD_ICON_SIZE
+    pixmap = mocker.spy(grid, "pixmap")
+    grid.grab()
+    assert grid.simplified
+    assert pixmap.call_count == 0
+
+
+def test_grid_place_label_skips_collisions():
+    from PyQt6.QtCore import QRect
+    from grid import GridWidget
+    grid = GridWidget.__new__(GridWidget)
+    grid.label_cells = None
+    assert grid.place_label(QRect(0, 0, 10, 10)) and grid.place_label(QRect(0, 0, 10, 10))
+
+    grid.label_cells = set()
+    assert grid.place_label(QRect(0, 0, 10, 10))
+    assert not grid.place_label(QRect(5, 5, 10, 10))
+    assert grid.place_label(QRect(100, 100, 10, 10))
+
+
+# === GridWidget: объединение перерисовок ===
+
+def test_grid_coalesces_wheel_events_into_one_frame(qtbot, mocker):
+    from grid import GridWidget
+    grid = GridWidget()
+    qtbot.addWidget(grid)
+    grid.resize(400, 300)
+    apply = mocker.spy(grid, "apply_pending_input")
+
+    event = mocker.Mock()
+    event.angleDelta.return_value.y.return_value = 120
+    event.position.return_value = QPointF(200, 150)
+    for _ in range(3):
+        grid.wheelEvent(event)
+
+    assert grid.scale == 40.0 and grid.snapshot is not None  # Пока кадр не наступил, вид не меняется
+    qtbot.waitUntil(lambda: apply.call_count > 0, timeout=1000)
+    assert grid.scale == pytest.approx(40.0 * 1.1 ** 3)
+    assert apply.call_count == 1
+
+    grid.grab()  # Во время жеста рисуется снимок
+    qtbot.waitUntil(lambda: grid.snapshot is None, timeout=1000)
+    assert grid.offset == QPointF(0, 0)
+
+
+def test_grid_pan_applies_accumulated_offset(qtbot, mocker):
+    from grid import GridWidget
+    grid = GridWidget()
+    qtbot.addWidget(grid)
+    grid.resize(400, 300)
+
+    event = mocker.Mock()
+    event.button.return_value = Qt.MouseButton.LeftButton
+    event.position.return_value = QPointF(100, 100)
+    grid.mousePressEvent(event)
+    for x in (110, 125, 140):
+        event.position.return_value = QPointF(x, 100)
+        grid.mouseMoveEvent(event)
+    grid.mouseReleaseEvent(event)
+
+    assert grid.offset == QPointF(40, 0)
+    assert grid.snapshot is None and not grid.frame_timer.isActive()
+
+
+# === GridWidget: выбор щелчком ===
+
+def test_scene_index_hit_test():
+    from grid import SceneIndex
+    beam, nodes = make_hinged_beam()
+    index = SceneIndex(beam)
+    assert index.hit_test(2.05, 0.05, 0.2) is nodes[1]
+    assert index.hit_test(3.0, 0.1, 0.2) is beam.topology.find_segment(nodes[1], nodes[2])
+    assert index.hit_test(3.0, 1.0, 0.2) is None
+
+
+def test_grid_click_selects_node_and_segment(qtbot, mocker):
+    from grid import GridWidget
+    grid = GridWidget()
+    qtbot.addWidget(grid)
+    grid.resize(400, 300)
+    grid.beam, nodes = make_hinged_beam()
+    selected = []
+    grid.selection_changed.connect(selected.append)
+
+    event = mocker.Mock()
+    event.button.return_value = Qt.MouseButton.LeftButton
+    for position in (QPointF(200 + 2 * 40, 150), QPointF(200 + 3 * 40, 151), QPointF(200, 50)):
+        event.position.return_value = position
+        grid.mousePressEvent(event)
+        grid.mouseReleaseEvent(event)
+
+    segment = grid.beam.topology.find_segment(nodes[1], nodes[2])
+    assert selected == [nodes[1], segment, None]
+    assert grid.offset == QPointF(0, 0)
+
+
+# === Beam: нумерация узлов и сегментов ===
+
+def test_beam_numbering_is_maintained_without_painting():
+    beam, nodes = make_hinged_beam()
+    assert [beam.node_numbering[number] for number in (1, 2, 3, 4)] == nodes
+    assert beam.segment_numbering.number(beam.topology.find_segment(nodes[2], nodes[3])) == 3
+    assert 0 not in beam.node_numbering and 5 not in beam.node_numbering
+
+    beam.remove_node(nodes[1])  # Вместе с узлом уходят сегменты 1 и 2
+    assert list(beam.node_numbering.items()) == [(1, nodes[0]), (2, nodes[2]), (3, nodes[3])]
+    assert list(beam.segment_numbering.values()) == [beam.topology.find_segment(nodes[2], nodes[3])]
+
+
+def test_dialog_manager_uses_beam_numbering_before_paint(monkeypatch):
+    from grid import GridWidget
+    grid = GridWidget()
+    beam, nodes = make_hinged_beam()
+    grid.beam = beam
+    manager = DialogManager(grid)
+    monkeypatch.setattr(ForceDialog, "exec", lambda self: True)
+    monkeypatch.setattr(ForceDialog, "get_data", lambda self: [2, 1, 7, 270, 1])
+    manager.open_force_dialog()
+    assert beam.segment_numbering[2].forces[-1].value == 7
+
+
+# === DialogManager: расчёт в фоновом потоке ===
+
+class BlockingBeam:
+    def __init__(self, error=None):
+        import threading
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.error = error
+
+    def solve(self, method='numeric'):
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {'Rx': 1.0}
+
+    def solve_job(self):
+        return DummyJob(self.solve)
+
+    def finish_job(self, job):
+        self.finished_job = job
+
+    def readable_answers(self, solution):
+        return solution
+
+
+def test_dialog_manager_solve_does_not_block(monkeypatch, qtbot):
+    from PyQt6.QtCore import QThreadPool
+    shown = []
+    monkeypatch.setattr("dialogs.SolveDialog", lambda answers: type("D", (), {"exec": lambda self: shown.append(answers)})())
+    grid = DummyGrid2()
+    grid.beam = BlockingBeam()
+    manager = DialogManager(grid)
+    manager.open_solve_dialog()  # Возвращается сразу, пока расчёт ещё идёт
+    assert grid.beam.started.wait(5)
+    assert manager.solve_task is not None and shown == []
+    grid.beam.release.set()
+    qtbot.waitUntil(lambda: shown == [{'Rx': 1.0}])
+    QThreadPool.globalInstance().waitForDone()
+
+
+def test_dialog_manager_solve_cancel_discards_result(monkeypatch, qtbot):
+    from PyQt6.QtCore import QThreadPool
+    shown = []
+    monkeypatch.setattr("dialogs.SolveDialog.exec", lambda self: shown.append(self))
+    grid = DummyGrid2()
+    grid.beam = BlockingBeam()
+    manager = DialogManager(grid)
+    manager.open_solve_dialog()
+    assert grid.beam.started.wait(5)
+    from PyQt6.QtWidgets import QPushButton
+    manager.solve_progress.findChild(QPushButton).click()  # Кнопка «Отмена»
+    assert manager.solve_task is None and manager.solve_progress is None
+    grid.beam.release.set()
+    QThreadPool.globalInstance().waitForDone()
+    qtbot.wait(50)
+    assert shown == []
+
+
+def test_dialog_manager_solve_reports_errors(monkeypatch, qtbot):
+    errors = []
+    monkeypatch.setattr("dialogs.QMessageBox.critical", lambda parent, title, text: errors.append(text))
+    grid = DummyGrid2()
+    grid.beam = BlockingBeam(UnsolvableError("Система подвижна"))
+    grid.beam.release.set()
+    manager = DialogManager(grid)
+    manager.open_solve_dialog()
+    qtbot.waitUntil(lambda: errors == ["Система подвижна"])
+    assert manager.solve_task is None
+
+
+def test_dialog_manager_solve_reuses_beam_factorization(monkeypatch, qtbot):
+    from tasks import SolveTask
+    shown = []
+    monkeypatch.setattr("dialogs.SolveDialog", lambda answers: type("D", (), {"exec": lambda self: shown.append(answers)})())
+    grid = DummyGrid2()
+    grid.beam, _ = make_hinged_beam()
+    manager = DialogManager(grid)
+    manager.open_solve_dialog()
+    qtbot.waitUntil(lambda: len(shown) == 1)
+    grid.beam.segment_numbering[3].forces[0].value = 20  # Правка нагрузки: система не пересобирается
+    grid.beam.mark_dirty(grid.beam.segment_numbering[3])
+    task = SolveTask(grid.beam)
+    assert task.job.factor is not None and task.job.matrix is None  # Разложение из расчёта в потоке
+    assert shown[0] != grid.beam.solve()
+
+    manager.open_solve_dialog()
+    qtbot.waitUntil(lambda: len(shown) == 2)
+    assert shown[1] == grid.beam.solve() and shown[1] != shown[0]
+
+
+# === Живой расчёт реакций ===
+
+def test_beam_reactions_by_node_number():
+    beam, _ = make_hinged_beam()
+    assert beam.reactions() == {1: (0.0, pytest.approx(-5.0), 0.0), 2: (0.0, pytest.approx(10.0), 0.0),
+                                4: (0.0, pytest.approx(5.0), 0.0)}
+
+
+def test_live_solve_draws_reactions_after_edit(monkeypatch, qtbot):
+    from grid import GridWidget
+    grid = GridWidget()
+    beam, nodes = make_hinged_beam()
+    grid.beam = beam
+    manager = DialogManager(grid)
+    manager.set_live_solve(True)
+    qtbot.waitUntil(lambda: nodes[3] in grid.reactions)
+    assert grid.reactions[nodes[3]][1] == pytest.approx(5.0)
+
+    monkeypatch.setattr(ForceDialog, "exec", lambda self: True)
+    monkeypatch.setattr(ForceDialog, "get_data", lambda self: [3, 1, 10, 270, 1])
+    manager.open_force_dialog()  # Вторая такая же сила на сегменте 3
+    qtbot.waitUntil(lambda: grid.reactions[nodes[3]][1] == pytest.approx(10.0))
+
+    grid.resize(400, 300)
+    grid.grab()  # Отрисовка стрелок реакций не падает
+
+    manager.set_live_solve(False)
+    assert grid.reactions == {}
+
+
+def test_live_solve_keeps_beam_cache_between_edits(monkeypatch, qtbot):
+    import copy
+    from grid import GridWidget
+    from tasks import SolveTask
+    monkeypatch.setattr(copy, "deepcopy", lambda *args: pytest.fail("модель не копируется"))
+    grid = GridWidget()
+    grid.beam, nodes = make_hinged_beam()
+    manager = DialogManager(grid)
+    manager.set_live_solve(True)
+    qtbot.waitUntil(lambda: nodes[3] in grid.reactions)
+    assert SolveTask(grid.beam).job.factor is not None  # Разложение из фонового расчёта сохранено
+
+    version = grid.beam.topology_version
+    monkeypatch.setattr(ForceDialog, "exec", lambda self: True)
+    monkeypatch.setattr(ForceDialog, "get_data", lambda self: [3, 1, 10, 270, 1])
+    manager.open_force_dialog()
+    qtbot.waitUntil(lambda: grid.reactions[nodes[3]][1] == pytest.approx(10.0))
+    assert grid.beam.topology_version == version
+
+
+def test_live_solve_debounces_and_cancels_stale_jobs(monkeypatch, qtbot):
+    from grid import GridWidget
+    from tasks import SolveTask
+    started = []
+    original_start = SolveTask.start
+    monkeypatch.setattr(SolveTask, "start", lambda self: started.append(self) or original_start(self))
+    grid = GridWidget()
+    grid.beam, nodes = make_hinged_beam()
+    manager = DialogManager(grid)
+    manager.live_solve = True
+    for _ in range(10):  # Серия быстрых правок — один расчёт
+        manager.model_changed()
+    qtbot.waitUntil(lambda: nodes[0] in grid.reactions)
+    assert len(started) == 1
+
+    manager.start_live_solve()
+    first = manager.live_task
+    manager.start_live_solve()  # Новая правка отменяет расчёт устаревшей модели
+    assert first.cancelled and manager.live_task is not first
+    qtbot.waitUntil(lambda: manager.live_task is None)
+
+
+# === Двоичный формат (.bmb) ===
+
+def test_binary_arrays_round_trip_is_lossless():
+    from serialization import arrays_to_dict, beam_to_dict, dict_to_arrays
+    beam, _ = make_hinged_beam()
+    beam.get_segments()[0].add_torque(Torque(-3, 1, custom_id=77))
+    data = beam_to_dict(beam)
+    assert arrays_to_dict(dict_to_arrays(data)) == data
+
+    del data['hinges']  # Старые файлы без списка шарниров
+    assert arrays_to_dict(dict_to_arrays(data)) == data
+
+
+def test_binary_file_loads_same_beam(tmp_path):
+    import numpy as np
+    from serialization import beam_to_dict, load_beam_from_file, read_beam_arrays, save_beam_to_file
+    beam, _ = make_hinged_beam()
+    save_beam_to_file(beam, str(tmp_path / "hinged.bmb"))
+    assert (tmp_path / "hinged.bmb").read_bytes().startswith(b'BEAMBIN')
+
+    arrays = read_beam_arrays(str(tmp_path / "hinged.bmb"))
+    assert isinstance(arrays['node_xy'].base, np.memmap)
+    assert arrays['node_xy'].tolist() == [[0, 0], [2, 0], [4, 0], [6, 0]]
+
+    loaded = Beam()
+    load_beam_from_file(str(tmp_path / "hinged.bmb"), loaded)
+    assert beam_to_dict(loaded) == beam_to_dict(beam)
+    assert loaded.solve() == beam.solve()
+
+
+def test_binary_beam_built_in_bulk_merges_and_validates():
+    from errors import HighDistanceError
+    from serialization import beam_from_arrays, beam_to_dict, dict_to_arrays
+    beam, _ = make_hinged_beam()
+    data = beam_to_dict(beam)
+    data['nodes'].append({**data['nodes'][1], 'id': 99, 'support': None, 'hinge_id': None})
+    data['segments'].append({**data['segments'][0], 'id': 98, 'forces': [], 'torques': []})
+    data['segments'][-1]['node2_id'] = 99
+    loaded = Beam()
+    beam_from_arrays(dict_to_arrays(data), loaded)
+    assert len(loaded.get_nodes()) == 4 and len(loaded.get_segments()) == 3  # Узел 99 слит с узлом 2
+    assert loaded.find_node(2, 0).owner is loaded and loaded.get_segments()[0].owner is loaded
+
+    data['segments'][2]['forces'][0]['node1_dist'] = 3
+    with pytest.raises(HighDistanceError):
+        beam_from_arrays(dict_to_arrays(data), Beam())
+
+
+def test_binary_convert_to_json_and_back(tmp_path):
+    from serialization import convert_beam_file, read_beam_dict, save_beam_to_file
+    beam, _ = make_hinged_beam()
+    save_beam_to_file(beam, str(tmp_path / "a.bm"))
+    convert_beam_file(str(tmp_path / "a.bm"), str(tmp_path / "b.bmb"))
+    convert_beam_file(str(tmp_path / "b.bmb"), str(tmp_path / "c.bm"))
+    convert_beam_file(str(tmp_path / "c.bm"), str(tmp_path / "d.bmb"))
+    assert read_beam_dict(str(tmp_path / "c.bm")) == read_beam_dict(str(tmp_path / "a.bm"))
+    assert (tmp_path / "d.bmb").read_bytes() == (tmp_path / "b.bmb").read_bytes()
+
+
+def test_binary_rejects_unknown_version(tmp_path):
+    import struct
+    from errors import FileFormatError
+    from serialization import BINARY_MAGIC, read_beam_arrays
+    (tmp_path / "future.bmb").write_bytes(BINARY_MAGIC + struct.pack('<II', 99, 2) + b'{}')
+    with pytest.raises(FileFormatError):
+        read_beam_arrays(str(tmp_path / "future.bmb"))
+    (tmp_path / "text.bmb").write_text("{}", encoding="utf-8")
+    with pytest.raises(FileFormatError):
+        read_beam_arrays(str(tmp_path / "text.bmb"))
+
+
+def test_binary_rejects_truncated_header(tmp_path):
+    import struct
+    from errors import FileFormatError
+    from serialization import BINARY_MAGIC, BINARY_VERSION, read_beam_arrays
+    (tmp_path / "short.bmb").write_bytes(BINARY_MAGIC + struct.pack('<II', BINARY_VERSION, 64) + b'{"arrays": {')
+    with pytest.raises(FileFormatError):
+        read_beam_arrays(str(tmp_path / "short.bmb"))
+    (tmp_path / "broken.bmb").write_bytes(BINARY_MAGIC + struct.pack('<II', BINARY_VERSION, 4) + b'\xff{"a')
+    with pytest.raises(FileFormatError):
+        read_beam_arrays(str(tmp_path / "broken.bmb"))
+    (tmp_path / "zero.bmb").write_bytes(BINARY_MAGIC + struct.pack('<II', 0, 2) + b'{}')
+    with pytest.raises(FileFormatError):
+        read_beam_arrays(str(tmp_path / "zero.bmb"))
+
+
+def test_batch_collects_both_formats(tmp_path):
+    from batch import collect_files
+    for name in ("a.bm", "b.bmb", "c.txt"):
+        (tmp_path / name).write_text("", encoding="utf-8")
+    assert [name.rsplit('/', 1)[-1].rsplit('\\', 1)[-1] for name in collect_files([str(tmp_path)])] == ["a.bm", "b.bmb"]
+
+
+# === Потоковая загрузка JSON ===
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_json_stream_loader_matches_saved_beam(tmp_path, chunk_size):
+    from serialization import beam_to_dict, load_beam_from_json_stream, save_beam_to_file
+    beam, _ = make_hinged_beam()
+    beam.get_segments()[0].add_torque(Torque(-3.25, 1.5))
+    save_beam_to_file(beam, str(tmp_path / "hinged.bm"))
+    loaded = Beam()
+    load_beam_from_json_stream(str(tmp_path / "hinged.bm"), loaded, chunk_size)
+    assert beam_to_dict(loaded) == beam_to_dict(beam)
+
+
+def test_json_stream_loader_accepts_any_key_order(tmp_path):
+    import json
+    from serialization import beam_to_dict, load_beam_from_file
+    beam, _ = make_hinged_beam()
+    data = beam_to_dict(beam)
+    reordered = {'hinges': data['hinges'], 'comment': [1, {'a': None}], 'segments': data['segments'],
+                 'nodes': data['nodes']}
+    (tmp_path / "reordered.bm").write_text(json.dumps(reordered), encoding="utf-8")
+    loaded = Beam()
+    load_beam_from_file(str(tmp_path / "reordered.bm"), loaded)
+    assert beam_to_dict(loaded) == data
+
+
+def test_json_stream_loader_reports_missing_and_broken_data(tmp_path):
+    import json
+    from serialization import load_beam_from_file
+    (tmp_path / "empty.bm").write_text("{}", encoding="utf-8")
+    with pytest.raises(KeyError):
+        load_beam_from_file(str(tmp_path / "empty.bm"), Beam())
+    (tmp_path / "broken.bm").write_text('{"nodes": [{"id": 1,', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        load_beam_from_file(str(tmp_path / "broken.bm"), Beam())
+
+
+def test_json_stream_loader_peak_memory(tmp_path):
+    import json
+    import tracemalloc
+    from serialization import load_beam_from_json_stream, save_beam_to_file
+    beam = Beam()
+    for i in range(300):
+        segment = beam.add_segment(BeamSegment(Node(i, 0), Node(i + 1, 0)))
+        for k in range(10):
+            segment.add_force(Force(10, 270, 0.1 * k, 1, False))
+    save_beam_to_file(beam, str(tmp_path / "big.bm"))
+
+    tracemalloc.start()
+    with open(tmp_path / "big.bm", encoding="utf-8") as f:
+        data = json.load(f)
+    dict_size, _ = tracemalloc.get_traced_memory()
+    del data
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    loaded = Beam()
+    load_beam_from_json_stream(str(tmp_path / "big.bm"), loaded)
+    model_size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(loaded.get_segments()) == 300
+    assert peak - model_size < dict_size / 4  # Словарь всего файла в памяти не появляется
+
+
+# === Beam.from_arrays ===
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_beam_from_arrays_matches_sequential_build(compact):
+    import numpy as np
+    beam, nodes = make_hinged_beam()
+    bulk = Beam.from_arrays(
+        np.array([(0, 0), (2, 0), (4, 0), (6, 0)]), np.array([(0, 1), (1, 2), (2, 3)]),
+        supports=[(0, Support.Type.PINNED.value, 0), (1, Support.Type.ROLLER.value, 0), (3, Support.Type.ROLLER.value, 0)],
+        hinges=[2], forces=[(2, 10, 270, 1, 1)], compact=compact)
+    assert [(node.x, node.y) for node in bulk.get_nodes()] == [(node.x, node.y) for node in nodes]
+    assert bulk.node_numbering[3].hinge is not None
+    assert bulk.find_node(6, 0) is bulk.node_numbering[4]
+    assert bulk.topology.find_segment(bulk.node_numbering[3], bulk.node_numbering[4]) is bulk.segment_numbering[3]
+    assert sorted(bulk.solve().values()) == sorted(beam.solve().values())
+
+
+def test_beam_from_arrays_merges_nodes_and_segments():
+    beam = Beam.from_arrays([(0, 0), (1, 0), (1, 0), (2, 0)], [(0, 1), (2, 3), (1, 0)],
+                            forces=[(2, 5, 270, 0.5, 1)], torques=[(1, 3, 0.5)])
+    assert len(beam.get_nodes()) == 3
+    first, second = beam.get_segments()
+    assert (len(first.forces), len(second.torques)) == (1, 1)
+    assert first.owner is beam and beam.node_numbering[2].owner is beam
+
+
+def test_beam_from_arrays_merges_nodes_by_distance_as_add_node():
+    import numpy as np
+    rng = np.random.default_rng(1)
+    cases = [np.array([(0.0004, 0), (0.0006, 0), (0.0016, 0), (1, 0)])]
+    cases += [np.concatenate([rng.integers(0, 20, (60, 2)) * 1e-3 + rng.uniform(-4e-4, 4e-4, (60, 2)),
+                              [(1, 1)]]) for _ in range(5)]
+    for coords in cases:
+        pairs = [(i, len(coords) - 1) for i in range(len(coords) - 1)]
+        beam = Beam.from_arrays(coords, pairs, tolerance=1e-3)
+        expected = Beam(tolerance=1e-3)
+        for i, j in pairs:
+            expected.add_segment(BeamSegment(Node(*coords[i]), Node(*coords[j])))
+        assert sorted((node.x, node.y) for node in beam.get_nodes()) == \
+            sorted((float(node.x), float(node.y)) for node in expected.get_nodes())
+        assert len(beam.get_segments()) == len(expected.get_segments())
+
+
+@pytest.mark.parametrize("arrays, error", [
+    ({'segments': [(0, 5)]}, NonExistentError),
+    ({'segments': [(0, 2)], 'coords': [(0, 0), (1, 0), (0, 0)]}, DotBeamError),
+    ({'forces': [(0, -1, 0, 0, 1)]}, NegativeOrZeroValueError),
+    ({'forces': [(0, 1, 0, 2, 1)]}, HighDistanceError),
+    ({'torques': [(1, 1, 0)]}, NonExistentError),
+    ({'supports': [(0, 7, 0)]}, IncorrectInputError),
+    ({'coords': [(0, 0), (1, float('nan'))]}, NotANumberError),
+])
+def test_beam_from_arrays_validates_before_building(arrays, error):
+    kwargs = {'coords': [(0, 0), (1, 0)], 'segments': [(0, 1)]}
+    kwargs.update(arrays)
+    with pytest.raises(error):
+        Beam.from_arrays(**kwargs)
+
+
+# === Векторная сборка нагрузок ===
+
+def test_force_units_match_force_properties():
+    import numpy as np
+    from structures import force_units
+    forces = [Force(1, angle, 0, length) for angle in (0, 30, 90, 135, 180, 250, 270, 359.5) for length in (1, 2.5)]
+    unit_x, unit_y = force_units(np.array([f.angle for f in forces]), np.array([f.length for f in forces]))
+    assert unit_x.tolist() == pytest.approx([f.unit_x for f in forces])
+    assert unit_y.tolist() == pytest.approx([f.unit_y for f in forces])
+    assert unit_x[[4, 5, 12, 13]].tolist() == [0, 0, 0, 0]  # 90° и 270° — ровно ноль
+
+
+def test_segment_loads_table_matches_per_force_terms():
+    from structures import add_force_to_system, add_segments_to_system
+    node1, node2 = Node(1, 2), Node(4, 6)
+    segment = BeamSegment(node1, node2)
+    for angle, dist in ((0, 0), (90, 1), (210, 2.5), (270, 5)):
+        segment.add_force(Force(3, angle, dist, 2))
+    segment.add_torque(Torque(7, 1))
+
+    system = LinearSystem()
+    rows = system.add_row(), system.add_row(), system.add_row()
+    add_segments_to_system(system, [(rows, segment)])
+
+    expected = LinearSystem()
+    for _ in rows:
+        expected.add_row()
+    for force in segment.forces:
+        t = force.node1_dist / segment.length
+        add_force_to_system(expected, rows, 'f', force, 1 + 3 * t, 2 + 4 * t, segment)
+    expected.add_load(rows[2], segment.torques[0], owner=segment)
+    assert system.rhs_vector().tolist() == pytest.approx(expected.rhs_vector().tolist())
+
+    system.clear_loads(segment)
+    assert system.rhs_vector().tolist() == [0, 0, 0]
+
+
+# === Кэш геометрии сегментов ===
+
+def test_segment_geometry_is_cached_until_node_moves():
+    node1, node2 = Node(1, 1), Node(4, 5)
+    segment = BeamSegment(node1, node2)
+    assert segment.length == 5
+    assert segment.direction == pytest.approx((0.6, 0.8))
+    assert segment.normal == pytest.approx((-0.8, 0.6))
+    assert segment.point_at(2.5) == pytest.approx((2.5, 3))
+    geometry = segment.geometry
+    assert segment.geometry == geometry
+
+    node2.move_to(1, 3)
+    assert segment.length == 2 and segment.direction == (0, 1)
+    node1.move_to(-1, 1)
+    assert segment.length == pytest.approx(8 ** 0.5)
+    segment.node2 = Node(-1, 7)
+    assert segment.length == 6
+
+
+def test_beam_node_move_updates_index_and_solution():
+    def build(x):
+        beam = Beam()
+        with beam.ids.activate():
+            node1, node2 = beam.add_node(Node(0, 0)), beam.add_node(Node(x, 0))
+            node1.add_support(Support(Support.Type.FIXED, 0, 0, 0, 0, True, True, True))
+            segment = BeamSegment(node1, node2)
+            segment.add_force(Force(10, 270, 2, 1))
+            beam.add_segment(segment)
+        return beam, node2
+
+    beam, node = build(4)
+    beam.solution()
+    node.move_to(6, 0)
+    assert beam.find_node(6, 0) is node and beam.find_node(4, 0) is None
+    assert beam.solution() == pytest.approx(build(6)[0].solution())
+
+
+def test_grid_draws_loads_along_segment_direction(qtbot, mocker):
+    from grid import GridWidget
+    grid = GridWidget()
+    qtbot.addWidget(grid)
+    grid.resize(400, 300)
+    node1, node2 = grid.beam.add_node(Node(0, 0)), grid.beam.add_node(Node(3, 4))
+    segment = BeamSegment(node1, node2)
+    segment.add_force(Force(1, 270, 0, 1))
+    segment.add_force(Force(1, 270, 5, 1))
+    segment.add_torque(Torque(1, 2.5))
+    grid.beam.add_segment(segment)
+
+    draw_force = mocker.spy(grid, "draw_force")
+    draw_torque = mocker.spy(grid, "draw_torque")
+    grid.grab()
+    (_, x1, y1, _), (_, x2, y2, _) = [call.args for call in draw_force.call_args_list]
+    assert (x2 - x1, y2 - y1) == pytest.approx((3 * grid.scale, -4 * grid.scale))
+    _, x, y, _ = draw_torque.call_args.args
+    assert (x, y) == pytest.approx(((x1 + x2) / 2, (y1 + y2) / 2))
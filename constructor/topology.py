@@ -0,0 +1,257 @@
+from collections.abc import Mapping
+import networkx as nx
+import numpy as np
+import scipy.sparse as sps
+from scipy.sparse.csgraph import connected_components
+
+
+# Хранилища топологии балки: узлы и соединяющие их сегменты.
+# Beam работает только через общий набор методов, поэтому хранилище можно заменить,
+# не меняя публичного API балки.
+
+
+# Хранилище на основе networkx: узлы графа — объекты Node, рёбра — {'object': сегмент}
+class GraphTopology:
+    def __init__(self):
+        self.graph = nx.Graph()
+
+    def nodes(self) -> list:
+        return list(self.graph.nodes)
+
+    def segments(self) -> list:
+        return [data['object'] for _, _, data in self.graph.edges(data=True)]
+
+    def number_of_nodes(self) -> int:
+        return self.graph.number_of_nodes()
+
+    def add_node(self, node):
+        self.graph.add_node(node)
+
+    # Удаляет узел вместе с примыкающими сегментами и возвращает эти сегменты
+    def remove_node(self, node) -> list:
+        removed = [data['object'] for _, _, data in self.graph.edges(node, data=True)]
+        self.graph.remove_node(node)
+        return removed
+
+    def clear(self):
+        self.graph.clear()
+
+    # Координаты узлов берутся из самих объектов Node, обновлять нечего
+    def move_node(self, node):
+        pass
+
+    def find_segment(self, node1, node2):
+        if self.graph.has_edge(node1, node2):
+            return self.graph[node1][node2]['object']
+        return None
+
+    def add_segment(self, node1, node2, segment):
+        self.graph.add_edge(node1, node2, object=segment)
+
+    # Добавляет сразу много новых узлов и сегментов; ends — пары индексов в nodes
+    def extend(self, nodes: list, ends: np.ndarray, segments: list):
+        self.graph.add_nodes_from(nodes)
+        self.graph.add_edges_from((nodes[i], nodes[j], {'object': segment})
+                                  for (i, j), segment in zip(ends.tolist(), segments))
+
+    # Пары (соседний узел, сегмент до него)
+    def incident(self, node):
+        for neighbor, data in self.graph.adj[node].items():
+            yield neighbor, data['object']
+
+    def is_connected(self) -> bool:
+        return nx.is_connected(self.graph)
+
+
+# Компактное хранилище для больших рам: узлы пронумерованы целыми индексами,
+# координаты лежат в массивах NumPy, смежность — в CSR-формате, который строится
+# лениво после изменений. Граф networkx (graph) создаётся только по запросу.
+class CompactTopology:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._nodes: list = []
+        self._index: dict = {}  # Узел -> индекс
+        self._segments: list = []
+        self._edges: dict[tuple[int, int], int] = {}  # (меньший индекс, больший) -> номер сегмента
+        self.coords = np.empty((0, 2))
+        self.ends = np.empty((0, 2), dtype=np.int64)  # Индексы концов каждого сегмента
+        self._csr = None
+        self._graph = None
+
+    def _changed(self):
+        self._csr = None
+        self._graph = None
+
+    def nodes(self) -> list:
+        return list(self._nodes)
+
+    def segments(self) -> list:
+        return list(self._segments)
+
+    def number_of_nodes(self) -> int:
+        return len(self._nodes)
+
+    # Место в массиве растёт удвоением, как у list, чтобы добавление было амортизированно O(1)
+    @staticmethod
+    def _append(array: np.ndarray, count: int, row) -> np.ndarray:
+        if count == len(array):
+            grown = np.empty((max(16, 2 * len(array)), array.shape[1]), dtype=array.dtype)
+            grown[:count] = array[:count]
+            array = grown
+        array[count] = row
+        return array
+
+    def add_node(self, node):
+        if node in self._index:
+            return
+        self._index[node] = len(self._nodes)
+        self.coords = self._append(self.coords, len(self._nodes), (node.x, node.y))
+        self._nodes.append(node)
+        self._changed()
+
+    def index(self, node) -> int:
+        return self._index[node]
+
+    def move_node(self, node):
+        self.coords[self._index[node]] = node.x, node.y
+
+    # Удаление перенумеровывает узлы, поэтому хранилище пересобирается (O(n), бывает редко)
+    def remove_node(self, node) -> list:
+        removed_index = self._index[node]
+        ends = self.ends[:len(self._segments)].tolist()
+        kept = [(self._nodes[i], self._nodes[j], segment) for (i, j), segment in zip(ends, self._segments)
+                if removed_index not in (i, j)]
+        removed = [segment for (i, j), segment in zip(ends, self._segments) if removed_index in (i, j)]
+        nodes = [n for n in self._nodes if n is not node]
+        self.clear()
+        for n in nodes:
+            self.add_node(n)
+        for node1, node2, segment in kept:
+            self.add_segment(node1, node2, segment)
+        return removed
+
+    def _key(self, node1, node2) -> tuple[int, int] | None:
+        i, j = self._index.get(node1), self._index.get(node2)
+        if i is None or j is None:
+            return None
+        return (i, j) if i < j else (j, i)
+
+    def find_segment(self, node1, node2):
+        key = self._key(node1, node2)
+        if key is None or key not in self._edges:
+            return None
+        return self._segments[self._edges[key]]
+
+    def add_segment(self, node1, node2, segment):
+        self.add_node(node1)
+        self.add_node(node2)
+        key = self._key(node1, node2)
+        self._edges[key] = len(self._segments)
+        self.ends = self._append(self.ends, len(self._segments), (self._index[node1], self._index[node2]))
+        self._segments.append(segment)
+        self._changed()
+
+    # Добавляет сразу много новых узлов и сегментов: массивы дописываются целиком
+    def extend(self, nodes: list, ends: np.ndarray, segments: list):
+        node_count, segment_count = len(self._nodes), len(self._segments)
+        self._index.update(zip(nodes, range(node_count, node_count + len(nodes))))
+        self._nodes.extend(nodes)
+        coords = np.array([(node.x, node.y) for node in nodes], dtype=float).reshape(-1, 2)
+        self.coords = np.concatenate([self.coords[:node_count], coords])
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1, 2) + node_count
+        self.ends = np.concatenate([self.ends[:segment_count], ends])
+        low, high = np.minimum(ends[:, 0], ends[:, 1]).tolist(), np.maximum(ends[:, 0], ends[:, 1]).tolist()
+        self._edges.update(zip(zip(low, high), range(segment_count, segment_count + len(segments))))
+        self._segments.extend(segments)
+        self._changed()
+
+    # Смежность в CSR: для узла i соседи лежат в indices[indptr[i]:indptr[i + 1]],
+    # а номера соответствующих сегментов — в edge_ids по тем же позициям
+    def csr(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._csr is None:
+            count = len(self._segments)
+            ends = self.ends[:count]
+            rows = np.concatenate([ends[:, 0], ends[:, 1]])
+            cols = np.concatenate([ends[:, 1], ends[:, 0]])
+            edge_ids = np.concatenate([np.arange(count), np.arange(count)])
+            order = np.argsort(rows, kind='stable')
+            indptr = np.zeros(len(self._nodes) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=len(self._nodes)), out=indptr[1:])
+            self._csr = indptr, cols[order], edge_ids[order]
+        return self._csr
+
+    def incident(self, node):
+        indptr, indices, edge_ids = self.csr()
+        i = self._index[node]
+        for position in range(indptr[i], indptr[i + 1]):
+            yield self._nodes[indices[position]], self._segments[edge_ids[position]]
+
+    def is_connected(self) -> bool:
+        count = len(self._nodes)
+        if count == 0:
+            return False
+        indptr, indices, _ = self.csr()
+        matrix = sps.csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(count, count))
+        components, _ = connected_components(matrix, directed=False)
+        return components == 1
+
+    # Представление в виде networkx для кода, которому нужен граф (строится один раз на изменение)
+    @property
+    def graph(self) -> nx.Graph:
+        if self._graph is None:
+            graph = nx.Graph()
+            graph.add_nodes_from(self._nodes)
+            for (node1, node2), segment in zip(self.ends[:len(self._segments)].tolist(), self._segments):
+                graph.add_edge(self._nodes[node1], self._nodes[node2], object=segment)
+            self._graph = graph
+        return self._graph
+
+
+# Нумерация элементов балки, которую видит пользователь: номер (с 1) -> объект.
+# Номера выдаются в порядке добавления; при удалении следующие элементы сдвигаются,
+# чтобы нумерация оставалась сплошной. Добавление и поиск — O(1), удаление — O(n).
+class Numbering(Mapping):
+    def __init__(self):
+        self._items: list = []
+        self._numbers: dict = {}  # Объект -> номер
+
+    def __getitem__(self, number: int):
+        if not isinstance(number, int) or not 1 <= number <= len(self._items):
+            raise KeyError(number)
+        return self._items[number - 1]
+
+    def __iter__(self):
+        return iter(range(1, len(self._items) + 1))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # Номер объекта или None, если объект не пронумерован
+    def number(self, item) -> int | None:
+        return self._numbers.get(item)
+
+    def objects(self) -> list:
+        return list(self._items)
+
+    def add(self, item):
+        if item not in self._numbers:
+            self._items.append(item)
+            self._numbers[item] = len(self._items)
+
+    def extend(self, items):
+        for item in items:
+            self.add(item)
+
+    def remove(self, item):
+        number = self._numbers.pop(item, None)
+        if number is None:
+            return
+        del self._items[number - 1]
+        for position in range(number - 1, len(self._items)):
+            self._numbers[self._items[position]] = position + 1
+
+    def clear(self):
+        self._items.clear()
+        self._numbers.clear()